@@ -0,0 +1,134 @@
+"""
+Compares the default app with LEAN_MODE=1: cold start time (importing the
+app and running its startup hooks under uvicorn until it accepts requests)
+and CPU per /tick request. Each timed request is a channel's first delivery
+of the day, of a lesson prepared beforehand, as in production; only the
+upstream lookups are stubbed out. Deliveries are queued in the outbox, whose
+consumers are not running.
+
+    python -m benchmarks.bench_lean [--runs 5] [--requests 2000]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+MODES = {
+    "default": {"LEAN_MODE": "0"},
+    "lean": {"LEAN_MODE": "1"},
+}
+
+
+def child_env(mode: str) -> dict:
+    state_dir = tempfile.mkdtemp()
+    return {
+        **os.environ,
+        **MODES[mode],
+        "LESSON_CACHE_PATH": "",
+        "LESSON_STORE_PATH": os.path.join(state_dir, "lessons.sqlite3"),
+        "OUTBOX_PATH": os.path.join(state_dir, "outbox.sqlite3"),
+    }
+
+
+async def start_app() -> float:
+    start = time.perf_counter()
+    from benchmarks.load_tick import free_port, serve
+    from src import main
+
+    server, task = await serve(main.app, free_port())
+    elapsed = time.perf_counter() - start
+    server.should_exit = True
+    await task
+    return elapsed
+
+
+def measure_startup(mode: str, runs: int) -> float:
+    args = [sys.executable, "-m", "benchmarks.bench_lean", "--child", "--startup"]
+    samples = [
+        float(subprocess.run(args, env=child_env(mode), check=True, capture_output=True, text=True).stdout)
+        for _ in range(runs)
+    ]
+    return statistics.median(samples)
+
+
+async def drive_ticks(requests: int, compact) -> float:
+    from datetime import datetime
+
+    import pytz
+    from httpx import AsyncClient
+    from src import main
+    from src.scheduler import local_date
+
+    async def fetch_word_data(word):
+        return "a stand-in definition", "A stand-in example."
+
+    async def fetch_pronunciation(word):
+        return "https://example.com/audio.mp3"
+
+    main.fetch_word_data = fetch_word_data
+    main.fetch_pronunciation = fetch_pronunciation
+    url = "/tick" if compact is None else f"/tick?compact={str(compact).lower()}"
+    payloads = [
+        {"channel_webhook_url": f"http://hooks.test/{i}", "language": "Spanish", "lesson_time": "00:00"}
+        for i in range(requests)
+    ]
+    # Prepare every channel's lesson for today, as the scheduler would, so
+    # each timed request is that channel's first (and only) delivery today.
+    today = local_date("UTC", datetime.now(pytz.utc))
+    for payload in payloads:
+        channel = payload["channel_webhook_url"]
+        lesson = await main.fetch_daily_lesson("Spanish", channel)
+        await asyncio.to_thread(main.lesson_store.put, channel, today, "Spanish", lesson)
+
+    async with AsyncClient(app=main.app, base_url="http://test") as client:
+        start = time.process_time()
+        for payload in payloads:
+            response = await client.post(url, json=payload)
+            assert response.status_code == 200
+            assert response.json()["status"] == "Lesson scheduled for delivery"
+        return (time.process_time() - start) / requests
+
+
+def measure_cpu(mode: str, requests: int, compact=None) -> float:
+    args = [sys.executable, "-m", "benchmarks.bench_lean", "--child", "--requests", str(requests)]
+    if compact is not None:
+        args += ["--compact", str(compact).lower()]
+    result = subprocess.run(args, env=child_env(mode), check=True, capture_output=True, text=True)
+    return float(result.stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--compact", choices=["true", "false"], help=argparse.SUPPRESS)
+    parser.add_argument("--startup", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child and args.startup:
+        print(asyncio.run(start_app()))
+        return
+    if args.child:
+        compact = None if args.compact is None else args.compact == "true"
+        print(asyncio.run(drive_ticks(args.requests, compact)))
+        return
+
+    print(f"{'mode':<28} {'startup (median)':>17} {'CPU per /tick':>14}")
+    rows = [
+        ("default", "default", None),
+        ("lean (full response)", "lean", False),
+        ("lean (compact response)", "lean", None),
+    ]
+    for label, mode, compact in rows:
+        startup_seconds = measure_startup(mode, args.runs)
+        cpu_seconds = measure_cpu(mode, args.requests, compact)
+        print(f"{label:<28} {startup_seconds * 1000:>14.1f} ms {cpu_seconds * 1e6:>11.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Quiz generation benchmark: index build time and quizzes per second.
+
+    python -m benchmarks.bench_quiz [--entries 20000] [--quizzes 20000]
+"""
+import argparse
+import random
+import time
+
+from src.quiz import QuizIndex
+
+
+def synthetic_definitions(entries: int, rng: random.Random) -> list:
+    vocabulary = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 9)))
+        for _ in range(3000)
+    ]
+    return [" ".join(rng.choice(vocabulary) for _ in range(rng.randint(4, 12))) for _ in range(entries)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=20_000)
+    parser.add_argument("--quizzes", type=int, default=20_000)
+    parser.add_argument("--dims", type=int, default=256)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    definitions = synthetic_definitions(args.entries, rng)
+    words = [f"word{i}" for i in range(args.entries)]
+
+    start = time.perf_counter()
+    index = QuizIndex(words, definitions, dims=args.dims)
+    build_seconds = time.perf_counter() - start
+
+    picks = [rng.randrange(args.entries) for _ in range(args.quizzes)]
+    start = time.perf_counter()
+    index.make_quizzes([words[i] for i in picks], [definitions[i] for i in picks], rng=rng)
+    quiz_seconds = time.perf_counter() - start
+
+    print(f"entries:      {args.entries:,} ({index.vectors.nbytes / 1e6:.1f} MB index, {args.dims} dims)")
+    print(f"index build:  {build_seconds:.2f} s")
+    print(f"quizzes:      {args.quizzes:,} in {quiz_seconds:.2f} s = {args.quizzes / quiz_seconds:,.0f} quizzes/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Vocabulary load benchmark: startup time, memory and sampling cost per million entries.
+
+    python -m benchmarks.bench_vocabulary [--entries 1000000] [--weighted]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from src.vocabulary import ChannelRotation, Vocabulary, read_entries
+
+
+def write_word_list(path: str, entries: int, weighted: bool) -> None:
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyzáéíñóú"
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write("word,weight\n" if weighted else "word\n")
+        for i in range(entries):
+            word = "".join(rng.choice(letters) for _ in range(rng.randint(4, 10))) + str(i)
+            handle.write(f"{word},{rng.randint(1, 100)}\n" if weighted else f"{word}\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=1_000_000)
+    parser.add_argument("--weighted", action="store_true")
+    parser.add_argument("--samples", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.csv")
+        write_word_list(path, args.entries, args.weighted)
+        file_size = os.path.getsize(path)
+
+        start = time.perf_counter()
+        vocabulary = Vocabulary("Bench", read_entries(path))
+        load_seconds = time.perf_counter() - start
+
+        # Memory is measured on a second load: tracemalloc slows allocation
+        # down too much to time the first one under it.
+        del vocabulary
+        tracemalloc.start()
+        vocabulary = Vocabulary("Bench", read_entries(path))
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for _ in range(args.samples):
+        vocabulary.weighted_sample(rng)
+    sample_seconds = time.perf_counter() - start
+
+    rotation = ChannelRotation(rng)
+    start = time.perf_counter()
+    for i in range(args.samples):
+        rotation.next_word(f"channel-{i % 500}", vocabulary)
+    rotation_seconds = time.perf_counter() - start
+
+    per_million = 1_000_000 / args.entries
+    print(f"entries:              {len(vocabulary):,} ({file_size / 1e6:.1f} MB on disk)")
+    print(f"load time:            {load_seconds:.2f} s  ({load_seconds * per_million:.2f} s per million)")
+    print(f"index size:           {vocabulary.nbytes() / 1e6:.1f} MB  ({vocabulary.nbytes() * per_million / 1e6:.1f} MB per million)")
+    print(f"retained after load:  {retained / 1e6:.1f} MB  (peak {peak / 1e6:.1f} MB)")
+    print(f"weighted sample:      {sample_seconds / args.samples * 1e6:.2f} us/op")
+    print(f"rotation next_word:   {rotation_seconds / args.samples * 1e6:.2f} us/op")
+
+
+if __name__ == "__main__":
+    main()
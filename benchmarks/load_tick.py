@@ -0,0 +1,160 @@
+"""
+Load test for /tick against local stand-ins for Oxford, Forvo and the Telex
+webhook, with configurable injected latency.
+
+    python -m benchmarks.load_tick [--requests 1000] [--concurrency 50]
+        [--oxford-latency 0.08] [--forvo-latency 0.05] [--webhook-latency 0.02]
+        [--channels N] [--cold]
+
+The stand-ins, the app (served by uvicorn with its normal startup hooks) and
+the load generator share one process and event loop, so absolute numbers
+include the generator's own overhead; compare runs on the same machine.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import tempfile
+import time
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def build_stand_ins(args, received: list):
+    from fastapi import FastAPI
+
+    stand_ins = FastAPI()
+
+    @stand_ins.get("/oxford/entries/{language_code}/{word}")
+    async def oxford(language_code: str, word: str):
+        await asyncio.sleep(args.oxford_latency)
+        return {"results": [{"lexicalEntries": [{"entries": [{"senses": [{
+            "definitions": [f"a stand-in definition of {word}"],
+            "examples": [{"text": f"An example using {word}."}],
+        }]}]}]}]}
+
+    @stand_ins.get("/forvo/key/{rest:path}")
+    async def forvo(rest: str):
+        await asyncio.sleep(args.forvo_latency)
+        return {"items": [{"pathmp3": "http://127.0.0.1/audio.mp3"}]}
+
+    @stand_ins.post("/webhook/{channel}")
+    async def webhook(channel: str):
+        await asyncio.sleep(args.webhook_latency)
+        received.append(channel)
+        return {"ok": True}
+
+    return stand_ins
+
+
+async def serve(app, port: int):
+    import uvicorn
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="on"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    return server, task
+
+
+def percentile(ordered: list, q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+async def run(args) -> None:
+    stand_in_port, app_port = free_port(), free_port()
+    state_dir = tempfile.mkdtemp()
+    os.environ.update({
+        "OXFORD_API_URL": f"http://127.0.0.1:{stand_in_port}/oxford",
+        "FORVO_API_URL": f"http://127.0.0.1:{stand_in_port}/forvo",
+        "LESSON_CACHE_PATH": "" if args.cold else os.path.join(state_dir, "cache.sqlite3"),
+        "CACHE_TTL": "0" if args.cold else os.environ.get("CACHE_TTL", "3600"),
+        "LESSON_STORE_PATH": os.path.join(state_dir, "lessons.sqlite3"),
+        "OUTBOX_PATH": os.path.join(state_dir, "outbox.sqlite3"),
+        "PREBUILD_INTERVAL": "86400",
+    })
+    # Every stand-in webhook shares one host, so lift the per-host webhook
+    # rate limit unless the run asks for it explicitly.
+    os.environ.setdefault("WEBHOOK_RATE_PER_HOST", "100000")
+    os.environ.setdefault("WEBHOOK_BURST_PER_HOST", "1000")
+    import httpx
+    from src.main import app
+    from src.metrics import stage_seconds
+
+    received: list = []
+    stand_ins, stand_ins_task = await serve(build_stand_ins(args, received), stand_in_port)
+    server, server_task = await serve(app, app_port)
+
+    channels = args.channels or args.requests
+    latencies, errors, scheduled = [], 0, 0
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{app_port}", limits=limits, timeout=30) as client:
+        async def one(i: int):
+            nonlocal errors, scheduled
+            payload = {
+                "channel_webhook_url": f"http://127.0.0.1:{stand_in_port}/webhook/{i % channels}",
+                "language": ("Spanish", "French", "German", "Mandarin", "Japanese")[i % 5],
+                "lesson_time": "00:00",
+            }
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    response = await client.post("/tick", json=payload)
+                    if response.status_code != 200:
+                        errors += 1
+                    elif response.json()["status"] == "Lesson scheduled for delivery":
+                        # Repeat ticks for a channel are not delivered again the same day.
+                        scheduled += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - start)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.requests)))
+        elapsed = time.perf_counter() - started
+
+        # Give the outbox consumers a moment to drain before reporting.
+        deadline = time.monotonic() + 10
+        while len(received) < scheduled and time.monotonic() < deadline:
+            await asyncio.sleep(0.05)
+
+    ordered = sorted(latencies)
+    print(f"requests:     {args.requests} at concurrency {args.concurrency} ({channels} channels, "
+          f"{'cold' if args.cold else 'warm'} cache)")
+    print(f"injected:     oxford {args.oxford_latency * 1000:.0f} ms, forvo {args.forvo_latency * 1000:.0f} ms, "
+          f"webhook {args.webhook_latency * 1000:.0f} ms")
+    print(f"throughput:   {args.requests / elapsed:,.1f} req/s over {elapsed:.2f} s, {errors} errors")
+    print(f"latency:      p50 {percentile(ordered, 0.50) * 1000:.1f} ms, p95 {percentile(ordered, 0.95) * 1000:.1f} ms, "
+          f"p99 {percentile(ordered, 0.99) * 1000:.1f} ms, max {ordered[-1] * 1000:.1f} ms")
+    print(f"delivered:    {len(received)} webhook posts of {scheduled} scheduled")
+    print("stage means:")
+    for stage in ("tick", "load_prepared_lesson", "fetch_word_data", "fetch_pronunciation",
+                  "build_lesson", "send_lesson", "deliver_webhook"):
+        count = stage_seconds.count(stage=stage)
+        if count:
+            print(f"  {stage:<22} {stage_seconds.sum(stage=stage) / count * 1000:8.2f} ms  (n={count})")
+
+    server.should_exit = stand_ins.should_exit = True
+    await asyncio.gather(server_task, stand_ins_task)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--channels", type=int, default=0, help="distinct channels (default: one per request)")
+    parser.add_argument("--oxford-latency", type=float, default=0.08)
+    parser.add_argument("--forvo-latency", type=float, default=0.05)
+    parser.add_argument("--webhook-latency", type=float, default=0.02)
+    parser.add_argument("--cold", action="store_true", help="disable the lesson cache")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+import asyncio
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from src.db import SQLiteDatabase
+
+
+class TTLCache:
+    """
+    In-process LRU cache whose entries also expire after a per-entry TTL.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.evictions = 0
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str, default=None):
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.time():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._data[key] = (time.time() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class SQLiteStore(SQLiteDatabase):
+    """
+    On-disk key/value store with expiry, shared by every cache namespace.
+    Calls are blocking, so async callers should run them in a thread.
+    """
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " expires_at REAL NOT NULL, PRIMARY KEY (namespace, key))"
+        )
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[float, Any]]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (namespace, key),
+            ).fetchone()
+        if row is None or row[1] <= time.time():
+            return None
+        return row[1], json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                (namespace, key, json.dumps(value), time.time() + ttl),
+            )
+            conn.commit()
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            conn = self._connection()
+            deleted = conn.execute("DELETE FROM cache WHERE expires_at <= ?", (time.time(),)).rowcount
+            conn.commit()
+        return deleted
+
+
+class TwoLevelCache:
+    """
+    Memory LRU in front of an optional SQLite store. Concurrent misses for the
+    same key share a single loader call, and negative results are cached with
+    their own (shorter) TTL.
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        store: Optional[SQLiteStore],
+        maxsize: int,
+        ttl: float,
+        negative_ttl: float,
+        is_negative: Callable[[Any], bool] = lambda value: False,
+    ):
+        self.namespace = namespace
+        self.memory = TTLCache(maxsize)
+        self.store = store
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.is_negative = is_negative
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "coalesced": 0, "negative_stored": 0}
+
+    async def get_or_fetch(self, key: str, loader: Callable[..., Awaitable[Any]], *args) -> Any:
+        value = self.memory.get(key, _MISSING)
+        if value is not _MISSING:
+            self.counters["memory_hits"] += 1
+            return value
+
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.counters["coalesced"] += 1
+            return await asyncio.shield(pending)
+
+        # Run the lookup as its own task so a caller that gives up (e.g. on its
+        # deadline) doesn't cancel the fetch for everyone else waiting on it.
+        task = asyncio.ensure_future(self._load(key, loader, *args))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _load(self, key: str, loader, *args) -> Any:
+        if self.store is not None:
+            stored = await asyncio.to_thread(self.store.get, self.namespace, key)
+            if stored is not None:
+                expires_at, value = stored
+                self.counters["disk_hits"] += 1
+                self.memory.set(key, value, expires_at - time.time())
+                return value
+
+        self.counters["misses"] += 1
+        value = await loader(*args)
+        ttl = self.ttl
+        if self.is_negative(value):
+            ttl = self.negative_ttl
+            self.counters["negative_stored"] += 1
+        self.memory.set(key, value, ttl)
+        if self.store is not None:
+            await asyncio.to_thread(self.store.set, self.namespace, key, value, ttl)
+        return value
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "evictions": self.memory.evictions,
+            "memory_entries": len(self.memory),
+            "persistent": self.store is not None,
+        }
+
+
+_MISSING = object()
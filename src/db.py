@@ -0,0 +1,42 @@
+import abc
+import os
+import sqlite3
+import threading
+from typing import Optional
+
+
+class SQLiteDatabase(abc.ABC):
+    """
+    Base for the app's SQLite-backed stores: one lazily opened WAL-mode
+    connection shared across worker threads and guarded by `_lock`.
+    Methods are blocking, so async callers should run them in a thread.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    @abc.abstractmethod
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        """
+        Creates (or migrates) the store's tables on a freshly opened connection.
+        """
+
+    def _connection(self) -> sqlite3.Connection:
+        # Callers hold `_lock`.
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._create_schema(conn)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
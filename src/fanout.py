@@ -0,0 +1,125 @@
+import asyncio
+import random
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from src import http_client
+
+# Webhook statuses worth retrying; any other 4xx is treated as permanent.
+RETRYABLE_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class HostRateLimiter:
+    """
+    Token bucket per destination host: `rate` requests per second with bursts
+    of up to `burst`.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def acquire(self, host: str) -> None:
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            while True:
+                now = time.monotonic()
+                tokens, updated = self._buckets.get(host, (float(self.burst), now))
+                tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+                if tokens >= 1:
+                    self._buckets[host] = (tokens - 1, now)
+                    return
+                self._buckets[host] = (tokens, now)
+                await asyncio.sleep((1 - tokens) / self.rate)
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """
+    Full-jitter exponential backoff for the given (1-based) attempt.
+    """
+    return random.uniform(0, min(cap, base * (2 ** (attempt - 1))))
+
+
+async def post_with_retry(
+    url: str,
+    content: bytes,
+    limiter: Optional[HostRateLimiter] = None,
+    max_attempts: int = 4,
+    backoff_base: float = 0.5,
+    backoff_cap: float = 8.0,
+) -> dict:
+    """
+    POSTs a JSON body to a webhook, retrying transient failures with jittered
+    backoff. Never raises; returns a result dict describing the outcome, with
+    `retryable` telling whether a failure is worth trying again later.
+    """
+    result = {"status": "failed", "attempts": 0, "status_code": None, "error": None, "retryable": False}
+    try:
+        host = httpx.URL(url).host
+    except Exception as exc:
+        result["error"] = f"{type(exc).__name__}: {exc}"
+        return result
+    for attempt in range(1, max_attempts + 1):
+        if limiter is not None:
+            await limiter.acquire(host)
+        result["attempts"] = attempt
+        try:
+            resp = await http_client.get_http_client().post(
+                url, content=content, headers={"Content-Type": "application/json"}
+            )
+        except httpx.UnsupportedProtocol as exc:
+            result["error"], result["retryable"] = f"{type(exc).__name__}: {exc}", False
+            return result
+        except httpx.HTTPError as exc:
+            result["status_code"], result["error"] = None, f"{type(exc).__name__}: {exc}"
+            result["retryable"] = True
+        except Exception as exc:
+            result["status_code"], result["error"] = None, f"{type(exc).__name__}: {exc}"
+            result["retryable"] = False
+            return result
+        else:
+            result["status_code"] = resp.status_code
+            if resp.is_success:
+                result["status"], result["error"], result["retryable"] = "delivered", None, False
+                return result
+            result["error"] = f"HTTP {resp.status_code}"
+            result["retryable"] = resp.status_code in RETRYABLE_STATUSES
+            if not result["retryable"]:
+                return result
+        if attempt < max_attempts:
+            await asyncio.sleep(backoff_delay(attempt, backoff_base, backoff_cap))
+    return result
+
+
+async def fan_out(
+    deliveries: Iterable[Tuple[str, bytes]],
+    concurrency: int,
+    limiter: Optional[HostRateLimiter] = None,
+    **retry_options,
+) -> List[dict]:
+    """
+    Delivers every (webhook_url, body) pair through a pool of `concurrency`
+    workers. Results come back in input order.
+    """
+    deliveries = list(deliveries)
+    results: List[Optional[dict]] = [None] * len(deliveries)
+    queue: "asyncio.Queue[int]" = asyncio.Queue()
+    for index in range(len(deliveries)):
+        queue.put_nowait(index)
+
+    async def worker():
+        while True:
+            try:
+                index = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            url, content = deliveries[index]
+            results[index] = await post_with_retry(url, content, limiter, **retry_options)
+
+    workers = min(concurrency, len(deliveries))
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    return results
@@ -0,0 +1,160 @@
+import asyncio
+import os
+from typing import Dict, Optional
+
+import httpx
+
+from src.metrics import upstream_errors, upstream_in_flight, upstream_responses
+
+try:
+    import h2  # noqa: F401  (optional, enables HTTP/2 negotiation in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Pool tuning, overridable from the environment.
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP_MAX_PER_HOST = int(os.getenv("HTTP_MAX_PER_HOST", "10"))
+HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "5"))
+HTTP_READ_TIMEOUT = float(os.getenv("HTTP_READ_TIMEOUT", "10"))
+HTTP_WRITE_TIMEOUT = float(os.getenv("HTTP_WRITE_TIMEOUT", "10"))
+HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "5"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "1") == "1" and HTTP2_AVAILABLE
+
+
+class PerHostLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    Wraps the default pooled transport and caps concurrent requests per host,
+    so one slow upstream cannot take every connection in the shared pool.
+    """
+
+    def __init__(self, max_per_host: int, transport: Optional[httpx.AsyncBaseTransport] = None,
+                 **transport_kwargs):
+        self._transport = transport or httpx.AsyncHTTPTransport(**transport_kwargs)
+        self._max_per_host = max_per_host
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._waiting: Dict[str, int] = {}
+        self._in_use: Dict[str, int] = {}
+
+    def _limit_for(self, host: str) -> asyncio.Semaphore:
+        limit = self._host_limits.get(host)
+        if limit is None:
+            limit = self._host_limits[host] = asyncio.Semaphore(self._max_per_host)
+        return limit
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        limit = self._limit_for(host)
+        self._waiting[host] = self._waiting.get(host, 0) + 1
+        try:
+            await limit.acquire()
+        finally:
+            self._waiting[host] -= 1
+        self._in_use[host] = self._in_use.get(host, 0) + 1
+        upstream_in_flight.inc(host=host)
+        try:
+            response = await self._transport.handle_async_request(request)
+            # Keep the slot until the body has been read; httpx reads it
+            # straight away for non-streaming calls.
+            await response.aread()
+        except httpx.HTTPError as exc:
+            upstream_errors.inc(host=host, error=type(exc).__name__)
+            raise
+        else:
+            upstream_responses.inc(host=host, status=response.status_code)
+        finally:
+            upstream_in_flight.dec(host=host)
+            self._in_use[host] -= 1
+            limit.release()
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+    def stats(self) -> dict:
+        """
+        Returns open/idle/waiting connection counts for the underlying pool.
+        """
+        pool = getattr(self._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []))
+        pool_waiting = [s for s in getattr(pool, "_requests", []) if s.connection is None]
+        return {
+            "open": sum(1 for c in connections if not c.is_closed()),
+            "idle": sum(1 for c in connections if c.is_idle()),
+            "waiting": len(pool_waiting) + sum(self._waiting.values()),
+            "waiting_per_host": {h: n for h, n in self._waiting.items() if n},
+            "in_use_per_host": {h: n for h, n in self._in_use.items() if n},
+        }
+
+
+_client: Optional[httpx.AsyncClient] = None
+_transport: Optional[PerHostLimitedTransport] = None
+
+
+def _build_client() -> httpx.AsyncClient:
+    global _transport
+    limits = httpx.Limits(
+        max_connections=HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+    )
+    timeout = httpx.Timeout(
+        connect=HTTP_CONNECT_TIMEOUT,
+        read=HTTP_READ_TIMEOUT,
+        write=HTTP_WRITE_TIMEOUT,
+        pool=HTTP_POOL_TIMEOUT,
+    )
+    _transport = PerHostLimitedTransport(
+        HTTP_MAX_PER_HOST, limits=limits, http2=HTTP2_ENABLED
+    )
+    return httpx.AsyncClient(transport=_transport, timeout=timeout)
+
+
+async def startup() -> None:
+    """
+    Opens the app-wide client pool. Called from the FastAPI startup hook.
+    """
+    global _client
+    if _client is None:
+        _client = _build_client()
+
+
+async def shutdown() -> None:
+    """
+    Closes the pool and every kept-alive connection. Called on app shutdown.
+    """
+    global _client, _transport
+    if _client is not None:
+        await _client.aclose()
+    _client = None
+    _transport = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Returns the shared client, creating it lazily if the startup hook has not run
+    (e.g. when the app is driven directly by a test client).
+    """
+    global _client
+    if _client is None:
+        _client = _build_client()
+    return _client
+
+
+def pool_stats() -> dict:
+    """
+    Snapshot of the shared pool for the diagnostics endpoint.
+    """
+    stats = _transport.stats() if _transport is not None else {
+        "open": 0, "idle": 0, "waiting": 0, "waiting_per_host": {}, "in_use_per_host": {},
+    }
+    stats.update({
+        "started": _client is not None,
+        "http2": HTTP2_ENABLED,
+        "max_connections": HTTP_MAX_CONNECTIONS,
+        "max_keepalive_connections": HTTP_MAX_KEEPALIVE,
+        "max_per_host": HTTP_MAX_PER_HOST,
+    })
+    return stats
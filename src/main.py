@@ -1,50 +1,258 @@
-from fastapi import FastAPI, BackgroundTasks
-from pydantic import BaseModel
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel, validator
 import httpx
-from datetime import datetime
+from typing import List, Optional, Tuple
+from fastapi.middleware.cors import CORSMiddleware
+from datetime import date, datetime, timedelta
 import pytz
-import random
+import asyncio
+import json
 import os
-from dotenv import load_dotenv
-load_dotenv()
+import time
+
+# Lean mode (LEAN_MODE=1, set in the real environment) is meant for production:
+# no .env loading, no CORS middleware, pre-encoded JSON responses, a compact
+# /tick reply by default, and the quiz bank (with numpy) built on first use
+# rather than at startup.
+LEAN_MODE = os.getenv("LEAN_MODE", "0") == "1"
+
+if not LEAN_MODE:
+    from dotenv import load_dotenv
+    load_dotenv()
+
+from src import http_client
+from src.cache import SQLiteStore, TTLCache, TwoLevelCache
+from src.fanout import HostRateLimiter
+from src.metrics import registry, stage_seconds, ticks_in_flight, upstream_seconds, upstream_summary
+from src.outbox import Outbox, QueueFull
+from src.scheduler import LessonScheduler, LessonStore, lesson_at, local_date, parse_lesson_time
+from src.vocabulary import ChannelRotation, VocabularyIndex
+
+try:
+    import orjson
+
+    def dumps(payload) -> bytes:
+        return orjson.dumps(payload)
+except ImportError:
+    def dumps(payload) -> bytes:
+        return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode()
 
 app = FastAPI()
 
-# Add CORS middleware to allow requests from all origins for testing.
-# You can restrict origins as needed (e.g., to ["https://app.telex.im"]).
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # Replace "*" with specific origins if needed.
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+if not LEAN_MODE:
+    # Add CORS middleware to allow requests from all origins for testing.
+    # You can restrict origins as needed (e.g., to ["https://app.telex.im"]).
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],  # Replace "*" with specific origins if needed.
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+@app.on_event("startup")
+async def on_startup():
+    await http_client.startup()
+    await asyncio.to_thread(vocabulary_index.load)
+    if not LEAN_MODE:
+        # Lean mode builds the quiz bank on the first lesson build instead.
+        await asyncio.to_thread(lambda: get_quiz_bank().load())
+    if cache_store is not None:
+        await asyncio.to_thread(cache_store.purge_expired)
+    await outbox.start()
+    await lesson_scheduler.start()
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await lesson_scheduler.stop()
+    await outbox.stop()
+    await http_client.shutdown()
+    # The scheduler, /tick and the word rotation share the lesson store.
+    lesson_store.close()
+    if cache_store is not None:
+        cache_store.close()
 
 # Replace these with your actual API credentials
 OXFORD_APP_ID = os.getenv("OXFORD_APP_ID")
 OXFORD_APP_KEY = os.getenv("OXFORD_APP_KEY")
 FORVO_API_KEY = "your_forvo_api_key"
+OXFORD_API_URL = os.getenv("OXFORD_API_URL", "https://od-api-sandbox.oxforddictionaries.com/api/v2")
+FORVO_API_URL = os.getenv("FORVO_API_URL", "https://apifree.forvo.com")
+
+# Word lists, one CSV/JSONL file per language.
+VOCABULARY_DIR = os.getenv("VOCABULARY_DIR", os.path.join(os.path.dirname(__file__), "..", "vocab"))
+
+vocabulary_index = VocabularyIndex(VOCABULARY_DIR)
+_quiz_bank = None
+
+def get_quiz_bank():
+    """
+    Returns the quiz bank, importing it (and numpy) on first use so they stay
+    off the app's import path.
+    """
+    global _quiz_bank
+    if _quiz_bank is None:
+        from src.quiz import QuizBank
+        _quiz_bank = QuizBank(vocabulary_index)
+    return _quiz_bank
+
+_quiz_bank_lock = asyncio.Lock()
+
+async def get_quiz_index(language: str):
+    """
+    Returns the quiz index for a language. If the bank hasn't been built yet,
+    builds it in a worker thread, once, however many lessons are waiting on it.
+    """
+    if _quiz_bank is None or not _quiz_bank.loaded:
+        async with _quiz_bank_lock:
+            await asyncio.to_thread(lambda: get_quiz_bank().get(language))
+    return get_quiz_bank().get(language)
+
+# Lesson pre-generation: how far ahead of lesson_time to build, how often to
+# check, and how fast to call upstream APIs while doing it.
+LESSON_STORE_PATH = os.getenv("LESSON_STORE_PATH", "var/lessons.sqlite3")
+PREBUILD_LEAD_HOURS = float(os.getenv("PREBUILD_LEAD_HOURS", "24"))
+PREBUILD_INTERVAL = float(os.getenv("PREBUILD_INTERVAL", "300"))
+PREBUILD_RATE = float(os.getenv("PREBUILD_RATE", "0.5"))
+
+# Per-source deadlines (seconds) used when assembling a lesson.
+WORD_DATA_TIMEOUT = float(os.getenv("WORD_DATA_TIMEOUT", "3"))
+PRONUNCIATION_TIMEOUT = float(os.getenv("PRONUNCIATION_TIMEOUT", "2"))
+
+# Lesson cache: in-process LRU backed by SQLite. Set LESSON_CACHE_PATH="" to keep it in memory only.
+LESSON_CACHE_PATH = os.getenv("LESSON_CACHE_PATH", "var/lesson_cache.sqlite3")
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "10000"))
+CACHE_TTL = float(os.getenv("CACHE_TTL", str(7 * 24 * 3600)))
+CACHE_NEGATIVE_TTL = float(os.getenv("CACHE_NEGATIVE_TTL", "3600"))
+
+cache_store = SQLiteStore(LESSON_CACHE_PATH) if LESSON_CACHE_PATH else None
+word_data_cache = TwoLevelCache(
+    "oxford", cache_store, CACHE_MAX_ENTRIES, CACHE_TTL, CACHE_NEGATIVE_TTL,
+    is_negative=lambda value: value[0] == "Definition not found.",
+)
+pronunciation_cache = TwoLevelCache(
+    "forvo", cache_store, CACHE_MAX_ENTRIES, CACHE_TTL, CACHE_NEGATIVE_TTL,
+    is_negative=lambda value: value == "",
+)
+
+# Webhook delivery: channels prepared at once per batch tick, per-host
+# webhook rate and retry backoff.
+FANOUT_CONCURRENCY = int(os.getenv("FANOUT_CONCURRENCY", "50"))
+WEBHOOK_RATE_PER_HOST = float(os.getenv("WEBHOOK_RATE_PER_HOST", "10"))
+WEBHOOK_BURST_PER_HOST = int(os.getenv("WEBHOOK_BURST_PER_HOST", "20"))
+WEBHOOK_BACKOFF_BASE = float(os.getenv("WEBHOOK_BACKOFF_BASE", "0.5"))
+WEBHOOK_BACKOFF_CAP = float(os.getenv("WEBHOOK_BACKOFF_CAP", "8"))
+
+webhook_rate_limiter = HostRateLimiter(WEBHOOK_RATE_PER_HOST, WEBHOOK_BURST_PER_HOST)
+
+# Durable delivery queue for /tick and /tick/batch: consumers, capacity and dead-letter threshold.
+OUTBOX_PATH = os.getenv("OUTBOX_PATH", "var/outbox.sqlite3")
+OUTBOX_CONSUMERS = int(os.getenv("OUTBOX_CONSUMERS", "4"))
+OUTBOX_MAX_DEPTH = int(os.getenv("OUTBOX_MAX_DEPTH", "10000"))
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
+OUTBOX_ENQUEUE_TIMEOUT = float(os.getenv("OUTBOX_ENQUEUE_TIMEOUT", "1"))
+
+outbox_gauges = registry.gauge("outbox", "Delivery queue depth, dead letters and oldest entry age.", ["metric"])
+registry.gauge(
+    "http_pool_connections", "Shared HTTP client pool connections by state.", ["state"],
+    callback=lambda: {(state,): http_client.pool_stats()[state] for state in ("open", "idle", "waiting")},
+)
+registry.gauge(
+    "lesson_cache", "Lesson cache counters by source.", ["source", "counter"],
+    callback=lambda: {
+        (name, counter): value
+        for name, cache in (("oxford", word_data_cache), ("forvo", pronunciation_cache))
+        for counter, value in cache.stats().items()
+        if not isinstance(value, bool)
+    },
+)
+
+lesson_store = LessonStore(LESSON_STORE_PATH)
+word_rotation = ChannelRotation(store=lesson_store)
+# The settings each channel last registered, so repeat ticks skip the SQLite write.
+REGISTERED_CHANNEL_TTL = float(os.getenv("REGISTERED_CHANNEL_TTL", "3600"))
+REGISTERED_CHANNEL_CACHE_SIZE = int(os.getenv("REGISTERED_CHANNEL_CACHE_SIZE", "10000"))
+registered_channels = TTLCache(REGISTERED_CHANNEL_CACHE_SIZE)
+SCHEDULED_STATUS = "Lesson scheduled for delivery"
+NOT_TIME_STATUS = "It's not time for the lesson yet."
+NO_LESSON_STATUS = "No lesson available for the specified language."
+COMPACT_TICK_RESPONSE = dumps({"status": SCHEDULED_STATUS})
+lesson_scheduler = LessonScheduler(
+    lesson_store,
+    lambda language, channel: fetch_daily_lesson(language, channel),
+    lead_time=timedelta(hours=PREBUILD_LEAD_HOURS),
+    interval=PREBUILD_INTERVAL,
+    builds_per_second=PREBUILD_RATE,
+)
+
+outbox = Outbox(
+    OUTBOX_PATH,
+    max_depth=OUTBOX_MAX_DEPTH,
+    max_attempts=OUTBOX_MAX_ATTEMPTS,
+    consumers=OUTBOX_CONSUMERS,
+    enqueue_timeout=OUTBOX_ENQUEUE_TIMEOUT,
+    backoff_base=WEBHOOK_BACKOFF_BASE,
+    backoff_cap=WEBHOOK_BACKOFF_CAP,
+    limiter=webhook_rate_limiter,
+)
 
 # Integration settings model
 class Settings(BaseModel):
     channel_webhook_url: str = "https://webhook.site/115812df-a8aa-44b8-9219-0455ba153a27"
     language: str = "Spanish"
     lesson_time: str = "08:00"
+    timezone: str = "UTC"
+
+    @validator("channel_webhook_url")
+    def check_channel_webhook_url(cls, value):
+        try:
+            url = httpx.URL(value)
+        except httpx.InvalidURL as exc:
+            raise ValueError(f"Invalid webhook URL: {exc}")
+        if url.scheme not in ("http", "https") or not url.host:
+            raise ValueError("Webhook URL must be an absolute http(s) URL")
+        return value
+
+    @validator("lesson_time")
+    def check_lesson_time(cls, value):
+        parse_lesson_time(value)
+        return value
+
+    @validator("timezone")
+    def check_timezone(cls, value):
+        if value not in pytz.all_timezones_set:
+            raise ValueError(f"Unknown timezone {value!r}")
+        return value
+
+class BatchTick(BaseModel):
+    channels: List[Settings]
+
+class UpstreamError(Exception):
+    """
+    Raised for upstream responses that should not be cached (rate limits, 5xx, ...).
+    """
 
 async def fetch_word_data(word: str) -> (str, str):
     """
     Asynchronously fetches word definition and an example sentence from the Oxford Dictionaries API.
+    Results, including "not found" answers, are served from the lesson cache when possible.
+    Raises UpstreamError when Oxford is rate limiting or failing.
     """
+    return await word_data_cache.get_or_fetch(word.lower(), _request_word_data, word)
+
+async def _request_word_data(word: str) -> (str, str):
     language_code = "en-us"  # Adjust if needed
-    url = f"https://od-api-sandbox.oxforddictionaries.com/api/v2/entries/{language_code}/{word.lower()}"
+    url = f"{OXFORD_API_URL}/entries/{language_code}/{word.lower()}"
     headers = {"app_id": OXFORD_APP_ID, "app_key": OXFORD_APP_KEY}
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=headers)
+    response = await http_client.get_http_client().get(url, headers=headers)
     
     if response.status_code == 200:
-        data = response.json()
+        try:
+            data = response.json()
+        except ValueError as exc:
+            raise UpstreamError(f"Oxford returned an unreadable body for {word!r}") from exc
         try:
             senses = data["results"][0]["lexicalEntries"][0]["entries"][0]["senses"][0]
             definition = senses["definitions"][0]
@@ -52,95 +260,316 @@ async def fetch_word_data(word: str) -> (str, str):
             return definition, example
         except (IndexError, KeyError):
             return "Definition not found.", "Example not found."
-    else:
+    elif response.status_code == 404:
         return "Definition not found.", "Example not found."
+    else:
+        raise UpstreamError(f"Oxford returned {response.status_code} for {word!r}")
 
 async def fetch_pronunciation(word: str) -> str:
     """
     Asynchronously fetches the pronunciation audio URL for the word from the Forvo API.
+    Results are served from the lesson cache when possible.
+    Raises UpstreamError when Forvo is rate limiting or failing.
     """
-    url = f"https://apifree.forvo.com/key/{FORVO_API_KEY}/format/json/action/word-pronunciations/word/{word}/language/en"
+    return await pronunciation_cache.get_or_fetch(word, _request_pronunciation, word)
+
+async def _request_pronunciation(word: str) -> str:
+    url = f"{FORVO_API_URL}/key/{FORVO_API_KEY}/format/json/action/word-pronunciations/word/{word}/language/en"
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url)
+    response = await http_client.get_http_client().get(url)
     
     if response.status_code == 200:
-        data = response.json()
+        try:
+            data = response.json()
+        except ValueError as exc:
+            raise UpstreamError(f"Forvo returned an unreadable body for {word!r}") from exc
         items = data.get("items", [])
         if items:
             return items[0].get("pathmp3", "")
         else:
             return ""
     else:
-        return ""
+        raise UpstreamError(f"Forvo returned {response.status_code} for {word!r}")
+
+async def _fetch_with_deadline(source: str, stage: str, coro, timeout: float):
+    """
+    Awaits an upstream call under its own deadline and records its latency.
+    Returns None if the source timed out or failed.
+    """
+    start = time.perf_counter()
+    outcome = "ok"
+    try:
+        return await asyncio.wait_for(coro, timeout)
+    except asyncio.TimeoutError:
+        outcome = "timeout"
+        return None
+    except (httpx.HTTPError, UpstreamError):
+        outcome = "error"
+        return None
+    finally:
+        elapsed = time.perf_counter() - start
+        upstream_seconds.observe(elapsed, source=source, outcome=outcome)
+        stage_seconds.observe(elapsed, stage=stage)
+
+async def advance_rotation(channel: str, language: str, word: str) -> None:
+    """
+    Moves the channel's rotation past `word` once its lesson is kept: stored
+    complete, or delivered degraded. A no-op if it has already moved on.
+    """
+    vocabulary = vocabulary_index.get(language)
+    if vocabulary is not None:
+        await asyncio.to_thread(word_rotation.advance_word, channel, vocabulary, word)
 
-async def fetch_daily_lesson(language: str) -> dict:
+async def fetch_daily_lesson(language: str, channel: Optional[str] = None) -> dict:
     """
     Constructs a lesson for the given language.
-    It selects a random word from a predefined list and fetches its definition, usage example, and pronunciation.
-    """
-    word_list = {
-        "Spanish": ["hola", "gracias", "amigo", "libro"],
-        "French": ["bonjour", "merci", "ami", "livre"],
-        "German": ["hallo", "danke", "freund", "buch"],
-        "Mandarin": ["你好", "谢谢", "朋友", "书"],
-        "Japanese": ["こんにちは", "ありがとう", "友達", "本"]
-    }
-    
-    words = word_list.get(language, ["hello"])
-    word = random.choice(words)
+    It picks a word from the language's vocabulary and fetches its definition, usage example, and pronunciation.
+    When a channel is given, words rotate without repeats until the channel has seen the whole list.
+    A degraded lesson doesn't move the rotation on, so a retry builds the same word; see advance_rotation.
+    """
+    vocabulary = vocabulary_index.get(language)
+    if vocabulary is None:
+        word = "hello"
+    elif channel is not None:
+        word = await asyncio.to_thread(word_rotation.peek_word, channel, vocabulary)
+    else:
+        word = vocabulary.weighted_sample()
     
-    definition, example = await fetch_word_data(word)
-    pronunciation_url = await fetch_pronunciation(word)
+    # Both sources are independent, so fetch them concurrently; a late source
+    # degrades the lesson instead of stalling it.
+    word_data, pronunciation_url = await asyncio.gather(
+        _fetch_with_deadline("oxford", "fetch_word_data", fetch_word_data(word), WORD_DATA_TIMEOUT),
+        _fetch_with_deadline("forvo", "fetch_pronunciation", fetch_pronunciation(word), PRONUNCIATION_TIMEOUT),
+    )
+    if word_data is None and pronunciation_url is None:
+        degraded = "unavailable"
+    elif word_data is None:
+        degraded = "audio_only"
+    elif pronunciation_url is None:
+        degraded = "definition_only"
+    else:
+        degraded = None
+        if channel is not None:
+            await advance_rotation(channel, language, word)
+
+    definition, example = word_data or ("Definition not available.", "Example not available.")
+    pronunciation_url = pronunciation_url or ""
     
-    # Create a dummy quiz for demonstration purposes
-    quiz_question = f"What is the meaning of '{word}'?"
-    quiz_options = [definition, "Option B", "Option C", "Option D"]
-    correct_answer = definition
+    # The quiz asks for the vocabulary's own gloss of the word, and wrong
+    # answers are the most similar glosses of other words. The Oxford
+    # definition is only a fallback, and a placeholder never becomes an answer.
+    quiz_index = await get_quiz_index(language)
+    with stage_seconds.time(stage="build_lesson"):
+        answer = quiz_index.gloss(word) if quiz_index is not None else None
+        if answer is None and word_data is not None and definition != "Definition not found.":
+            answer = definition
+        if answer is None:
+            quiz = {"quiz_question": None, "quiz_options": [], "correct_answer": None}
+        elif quiz_index is not None:
+            quiz = quiz_index.make_quizzes([word], [answer])[0]
+        else:
+            quiz = {
+                "quiz_question": f"What is the meaning of '{word}'?",
+                "quiz_options": [answer],
+                "correct_answer": answer,
+            }
     
     return {
         "word": word,
         "definition": definition,
         "usage": example,
         "pronunciation_url": pronunciation_url,
-        "quiz_question": quiz_question,
-        "quiz_options": quiz_options,
-        "correct_answer": correct_answer
+        **quiz,
+        "degraded": degraded
     }
 
-async def send_lesson(webhook_url: str, lesson: dict):
+def render_lesson_message(lesson: dict) -> dict:
     """
-    Sends the constructed lesson to the provided webhook URL.
+    Builds the Telex webhook message for a lesson.
     """
-    message = {
-        "text": (
-            f"**Daily Language Lesson**\n\n"
-            f"**Word:** {lesson['word']}\n"
-            f"**Definition:** {lesson['definition']}\n"
-            f"**Usage:** {lesson['usage']}\n"
-            f"**Pronunciation Audio:** [Listen Here]({lesson['pronunciation_url']})\n\n"
-            f"**Quiz:** {lesson['quiz_question']}\n"
+    text = (
+        f"**Daily Language Lesson**\n\n"
+        f"**Word:** {lesson['word']}\n"
+        f"**Definition:** {lesson['definition']}\n"
+        f"**Usage:** {lesson['usage']}\n"
+        f"**Pronunciation Audio:** [Listen Here]({lesson['pronunciation_url']})"
+    )
+    if lesson.get("quiz_question"):
+        text += (
+            f"\n\n**Quiz:** {lesson['quiz_question']}\n"
             f"Options: {', '.join(lesson['quiz_options'])}\n"
             f"Reply with your answer."
-        ),
+        )
+    return {
+        "text": text,
         "username": "Language Learning Assistant"
     }
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(webhook_url, json=message)
-        resp.raise_for_status()
+
+def render_lesson_body(lesson: dict) -> bytes:
+    """
+    Encodes the webhook message for a lesson, ready to post.
+    """
+    return dumps(render_lesson_message(lesson))
+
+async def send_lesson(webhook_url: str, lesson: dict, body: Optional[bytes] = None):
+    """
+    Queues the constructed lesson for durable delivery to the provided webhook URL.
+    Pass `body` to reuse an already rendered message. Raises QueueFull if the outbox has no room.
+    """
+    with stage_seconds.time(stage="send_lesson"):
+        await outbox.enqueue(webhook_url, body or render_lesson_body(lesson))
+
+async def get_prepared_lesson(settings: Settings, today: date) -> Optional[Tuple[dict, bytes]]:
+    """
+    Returns the channel's pre-built lesson for its local date `today` with its
+    rendered webhook body. If the scheduler hasn't prepared one yet (e.g. a
+    channel's first tick), builds it live and stores it.
+    """
+    channel = settings.channel_webhook_url
+    with stage_seconds.time(stage="load_prepared_lesson"):
+        lesson = await asyncio.to_thread(lesson_store.get, channel, today, settings.language)
+    if lesson is None:
+        lesson = await fetch_daily_lesson(settings.language, channel)
+        if lesson is None:
+            return None
+        if lesson.get("degraded"):
+            return lesson, render_lesson_body(lesson)
+        await asyncio.to_thread(lesson_store.put, channel, today, settings.language, lesson)
+    return lesson, render_lesson_body(lesson)
+
+async def register_channel(settings: Settings) -> None:
+    """
+    Records the channel for pre-generation, skipping the write when its
+    settings haven't changed since the last tick.
+    """
+    registration = (settings.language, settings.lesson_time, settings.timezone)
+    if registered_channels.get(settings.channel_webhook_url) == registration:
+        return
+    await asyncio.to_thread(lesson_store.register_channel, settings.channel_webhook_url, *registration)
+    registered_channels.set(settings.channel_webhook_url, registration, REGISTERED_CHANNEL_TTL)
+
+async def schedule_lesson(settings: Settings, now: datetime) -> Tuple[str, Optional[dict]]:
+    """
+    Queues the channel's lesson in the outbox if its lesson_time has passed
+    today (in its timezone) and today's lesson hasn't been delivered yet.
+    Returns (status, lesson); lesson is None when nothing was queued.
+    Raises QueueFull if the outbox has no room.
+    """
+    await register_channel(settings)
+    # Each channel gets one lesson per local day, at or after its lesson_time.
+    channel = settings.channel_webhook_url
+    today = local_date(settings.timezone, now)
+    if now < lesson_at(today, settings.lesson_time, settings.timezone):
+        return NOT_TIME_STATUS, None
+    if await asyncio.to_thread(lesson_store.delivered, channel, today):
+        return NOT_TIME_STATUS, None
+    prepared = await get_prepared_lesson(settings, today)
+    if prepared is None:
+        return NO_LESSON_STATUS, None
+    lesson, body = prepared
+    if not await asyncio.to_thread(lesson_store.claim_delivery, channel, today, settings.language, lesson):
+        return NOT_TIME_STATUS, None
+    try:
+        await send_lesson(channel, lesson, body)
+    except QueueFull:
+        await asyncio.to_thread(lesson_store.release_delivery, channel, today)
+        raise
+    if lesson.get("degraded"):
+        await advance_rotation(channel, settings.language, lesson["word"])
+    return SCHEDULED_STATUS, lesson
 
 @app.post("/tick")
-async def tick(settings: Settings, background_tasks: BackgroundTasks):
-    lesson = await fetch_daily_lesson(settings.language)
+async def tick(settings: Settings, compact: Optional[bool] = None):
+    with ticks_in_flight.track_inprogress(endpoint="/tick"), stage_seconds.time(stage="tick"):
+        return await _tick(settings, LEAN_MODE if compact is None else compact)
+
+async def _tick(settings: Settings, compact: bool):
+    try:
+        status, lesson = await schedule_lesson(settings, datetime.now(pytz.utc))
+    except QueueFull as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
     if lesson is None:
-        return {"status": "No lesson available for the specified language."}
-    background_tasks.add_task(send_lesson, settings.channel_webhook_url, lesson)
-    return {"status": "Lesson scheduled for delivery", "lesson": lesson}
+        return {"status": status}
+    if compact:
+        return Response(COMPACT_TICK_RESPONSE, media_type="application/json")
+    if LEAN_MODE:
+        payload = {"status": status, "lesson": lesson}
+        return Response(dumps(payload), media_type="application/json")
+    return {"status": status, "lesson": lesson}
+
+@app.post("/tick/batch")
+async def tick_batch(batch: BatchTick):
+    """
+    Ticks many channels in one call. Each channel goes through the same path
+    as /tick: its prepared lesson (or, on first contact, one built live with
+    its own word rotation) is queued in the durable outbox at or after its
+    lesson_time, once per local day. The outbox consumers then deliver with
+    per-host rate limiting and jittered retries, so the request doesn't wait
+    on webhooks. Up to FANOUT_CONCURRENCY channels are prepared at a time.
+    """
+    with ticks_in_flight.track_inprogress(endpoint="/tick/batch"), stage_seconds.time(stage="tick_batch"):
+        return await _tick_batch(batch)
+
+async def _tick_batch(batch: BatchTick):
+    now = datetime.now(pytz.utc)
+    limit = asyncio.Semaphore(FANOUT_CONCURRENCY)
+
+    async def tick_channel(settings: Settings) -> dict:
+        async with limit:
+            try:
+                status, _ = await schedule_lesson(settings, now)
+            except QueueFull as exc:
+                status = str(exc)
+        return {
+            "channel_webhook_url": settings.channel_webhook_url,
+            "language": settings.language,
+            "status": status,
+        }
+
+    summary = await asyncio.gather(*(tick_channel(channel) for channel in batch.channels))
+    queued = sum(1 for result in summary if result["status"] == SCHEDULED_STATUS)
+    return {
+        "status": "Batch processed",
+        "queued": queued,
+        "not_queued": len(summary) - queued,
+        "channels": summary,
+    }
 
 @app.get("/")
 async def read_root():
     return {"message": "Language Learning Assistant API is running."}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    outbox_metrics = await outbox.metrics()
+    for key in ("depth", "dead", "oldest_age_seconds"):
+        outbox_gauges.set(outbox_metrics[key], metric=key)
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/diagnostics/upstream-latency")
+async def upstream_latency_diagnostics():
+    return upstream_summary()
+
+@app.get("/diagnostics/cache")
+async def cache_diagnostics():
+    return {"oxford": word_data_cache.stats(), "forvo": pronunciation_cache.stats()}
+
+@app.get("/diagnostics/outbox")
+async def outbox_diagnostics():
+    return await outbox.metrics()
+
+@app.get("/diagnostics/scheduler")
+async def scheduler_diagnostics():
+    return lesson_scheduler.counters
+
+@app.get("/diagnostics/vocabulary")
+async def vocabulary_diagnostics():
+    return vocabulary_index.languages()
+
+@app.get("/diagnostics/http-pool")
+async def http_pool_diagnostics():
+    return http_client.pool_stats()
+
 # Render deployment adjustment: run on host 0.0.0.0 and port from environment variable.
 if __name__ == "__main__":
     import uvicorn
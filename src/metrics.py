@@ -0,0 +1,231 @@
+import abc
+import bisect
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+
+# Prometheus-style metrics, rendered in the text exposition format on /metrics.
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Metric(abc.ABC):
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _format_labels(self, values: LabelValues, extra: Sequence[Tuple[str, str]] = ()) -> str:
+        pairs = list(zip(self.labelnames, values)) + list(extra)
+        if not pairs:
+            return ""
+        escaped = (v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in pairs)
+        return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + "}"
+
+    @abc.abstractmethod
+    def samples(self) -> Iterator[str]:
+        ...
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}", *self.samples()]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[str]:
+        for key, value in sorted(self._values.items()):
+            yield f"{self.name}{self._format_labels(key)} {value:g}"
+
+
+class Gauge(_Metric):
+    """
+    A gauge set directly, or computed at scrape time by `callback`, which
+    returns {label values: value}.
+    """
+
+    kind = "gauge"
+
+    def __init__(self, *args, callback: Callable[[], Dict[LabelValues, float]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback = callback
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels) -> None:
+        self._values[self._key(labels)] = value
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    @contextmanager
+    def track_inprogress(self, **labels):
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+    def samples(self) -> Iterator[str]:
+        values = self._callback() if self._callback is not None else self._values
+        for key, value in sorted(values.items()):
+            yield f"{self.name}{self._format_labels(key)} {value:g}"
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = DEFAULT_BUCKETS, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def sum(self, **labels) -> float:
+        return self._sums.get(self._key(labels), 0.0)
+
+    def label_values(self) -> List[LabelValues]:
+        return sorted(self._counts)
+
+    def quantile(self, q: float, **labels) -> float:
+        """
+        Estimates the q-quantile from the buckets, interpolating within the
+        bucket it falls in (as PromQL's histogram_quantile does). `labels` may
+        name only some of the labels; every matching series is merged.
+        """
+        positions = {self.labelnames.index(name): str(value) for name, value in labels.items()}
+        counts = [0] * (len(self.buckets) + 1)
+        for key, series in self._counts.items():
+            if all(key[i] == value for i, value in positions.items()):
+                counts = [a + b for a, b in zip(counts, series)]
+        total = sum(counts)
+        if not total:
+            return 0.0
+        rank = q * total
+        cumulative, lower = 0, 0.0
+        for bound, count in zip(self.buckets, counts):
+            if count and cumulative + count >= rank:
+                return lower + (bound - lower) * (rank - cumulative) / count
+            cumulative, lower = cumulative + count, bound
+        # Beyond the last finite bucket: its upper bound is the best estimate.
+        return lower
+
+    def samples(self) -> Iterator[str]:
+        for key in sorted(self._counts):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), self._counts[key]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                yield f"{self.name}_bucket{self._format_labels(key, [('le', le)])} {cumulative}"
+            yield f"{self.name}_sum{self._format_labels(key)} {self._sums[key]:g}"
+            yield f"{self.name}_count{self._format_labels(key)} {cumulative}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (), callback=None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, callback=callback))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets=buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+stage_seconds = registry.histogram(
+    "lesson_stage_seconds", "Time spent in each stage of serving a tick.", ["stage"]
+)
+upstream_seconds = registry.histogram(
+    "upstream_request_seconds", "Latency of upstream lookups by source and outcome.", ["source", "outcome"]
+)
+upstream_responses = registry.counter(
+    "upstream_responses_total", "Outbound HTTP responses by host and status code.", ["host", "status"]
+)
+upstream_errors = registry.counter(
+    "upstream_errors_total", "Outbound HTTP requests that failed without a response.", ["host", "error"]
+)
+upstream_in_flight = registry.gauge(
+    "upstream_requests_in_flight", "Outbound HTTP requests currently in flight.", ["host"]
+)
+ticks_in_flight = registry.gauge("ticks_in_flight", "Tick requests currently being handled.", ["endpoint"])
+
+
+def upstream_summary() -> dict:
+    """
+    Per-source outcome counts and latency percentiles for the diagnostics
+    endpoint, derived from `upstream_seconds`.
+    """
+    report = {}
+    for source in sorted({source for source, _ in upstream_seconds.label_values()}):
+        counts = {outcome: upstream_seconds.count(source=source, outcome=outcome)
+                  for outcome in ("ok", "timeout", "error")}
+        total = sum(counts.values())
+        seconds = sum(upstream_seconds.sum(source=source, outcome=outcome) for outcome in counts)
+        report[source] = {
+            **counts,
+            "p50_ms": round(upstream_seconds.quantile(0.50, source=source) * 1000, 2),
+            "p95_ms": round(upstream_seconds.quantile(0.95, source=source) * 1000, 2),
+            "mean_ms": round(seconds / total * 1000, 2) if total else 0.0,
+        }
+    return report
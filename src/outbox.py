@@ -0,0 +1,227 @@
+import asyncio
+import logging
+import sqlite3
+import time
+from typing import List, Optional
+
+from src.db import SQLiteDatabase
+from src.fanout import HostRateLimiter, backoff_delay, post_with_retry
+from src.metrics import stage_seconds
+
+logger = logging.getLogger(__name__)
+
+
+class QueueFull(Exception):
+    """
+    Raised when the outbox stays at capacity for longer than the enqueue timeout.
+    """
+
+
+class Outbox(SQLiteDatabase):
+    """
+    Durable webhook delivery queue stored in SQLite. Deliveries survive
+    restarts, are retried with jittered backoff by a fixed number of async
+    consumers, and are dead-lettered after `max_attempts`.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_depth: int = 10000,
+        max_attempts: int = 5,
+        consumers: int = 4,
+        enqueue_timeout: float = 1.0,
+        poll_interval: float = 1.0,
+        backoff_base: float = 1.0,
+        backoff_cap: float = 60.0,
+        limiter: Optional[HostRateLimiter] = None,
+    ):
+        super().__init__(path)
+        self.max_depth = max_depth
+        self.max_attempts = max_attempts
+        self.consumers = consumers
+        self.enqueue_timeout = enqueue_timeout
+        self.poll_interval = poll_interval
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.limiter = limiter
+        self.counters = {"enqueued": 0, "delivered": 0, "retried": 0, "dead_lettered": 0, "rejected": 0}
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS outbox ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, webhook_url TEXT NOT NULL, body BLOB NOT NULL,"
+            " status TEXT NOT NULL DEFAULT 'pending', attempts INTEGER NOT NULL DEFAULT 0,"
+            " created_at REAL NOT NULL, next_attempt_at REAL NOT NULL, last_error TEXT)"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS outbox_due ON outbox (status, next_attempt_at)")
+
+    # Blocking SQLite operations; the async API runs them in a worker thread.
+
+    def _insert(self, webhook_url: str, body: bytes) -> Optional[int]:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            (depth,) = conn.execute("SELECT COUNT(*) FROM outbox WHERE status != 'dead'").fetchone()
+            if depth >= self.max_depth:
+                return None
+            cursor = conn.execute(
+                "INSERT INTO outbox (webhook_url, body, created_at, next_attempt_at) VALUES (?, ?, ?, ?)",
+                (webhook_url, body, now, now),
+            )
+            conn.commit()
+            return cursor.lastrowid
+
+    def _claim(self) -> Optional[tuple]:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT id, webhook_url, body, attempts FROM outbox"
+                " WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY next_attempt_at, id LIMIT 1",
+                (time.time(),),
+            ).fetchone()
+            if row is not None:
+                conn.execute("UPDATE outbox SET status = 'inflight' WHERE id = ?", (row[0],))
+                conn.commit()
+            return row
+
+    def _complete(self, row_id: int) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM outbox WHERE id = ?", (row_id,))
+            conn.commit()
+
+    def _fail(self, row_id: int, attempts: int, error: str, dead: bool) -> None:
+        with self._lock:
+            conn = self._connection()
+            if dead:
+                conn.execute(
+                    "UPDATE outbox SET status = 'dead', attempts = ?, last_error = ? WHERE id = ?",
+                    (attempts, error, row_id),
+                )
+            else:
+                retry_at = time.time() + backoff_delay(attempts, self.backoff_base, self.backoff_cap)
+                conn.execute(
+                    "UPDATE outbox SET status = 'pending', attempts = ?, last_error = ?, next_attempt_at = ?"
+                    " WHERE id = ?",
+                    (attempts, error, retry_at, row_id),
+                )
+            conn.commit()
+
+    def _release(self, row_id: int) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute("UPDATE outbox SET status = 'pending' WHERE id = ? AND status = 'inflight'", (row_id,))
+            conn.commit()
+
+    def _recover(self) -> None:
+        # Rows left in flight by a crash or restart are simply retried.
+        with self._lock:
+            conn = self._connection()
+            conn.execute("UPDATE outbox SET status = 'pending' WHERE status = 'inflight'")
+            conn.commit()
+
+    def _snapshot(self) -> dict:
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT status, COUNT(*), MIN(created_at) FROM outbox GROUP BY status"
+            ).fetchall()
+        now = time.time()
+        by_status = {status: (count, oldest) for status, count, oldest in rows}
+        pending, oldest_pending = by_status.get("pending", (0, None))
+        inflight, oldest_inflight = by_status.get("inflight", (0, None))
+        oldest = min((t for t in (oldest_pending, oldest_inflight) if t is not None), default=None)
+        return {
+            "depth": pending + inflight,
+            "pending": pending,
+            "inflight": inflight,
+            "dead": by_status.get("dead", (0, None))[0],
+            "oldest_age_seconds": round(now - oldest, 3) if oldest is not None else 0.0,
+            "max_depth": self.max_depth,
+        }
+
+    # Async API
+
+    async def enqueue(self, webhook_url: str, body: bytes) -> int:
+        """
+        Persists a delivery. Waits up to `enqueue_timeout` for room when the
+        queue is full, then raises QueueFull.
+        """
+        deadline = time.monotonic() + self.enqueue_timeout
+        while True:
+            row_id = await asyncio.to_thread(self._insert, webhook_url, body)
+            if row_id is not None:
+                self.counters["enqueued"] += 1
+                self._wakeup.set()
+                return row_id
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.counters["rejected"] += 1
+                raise QueueFull(f"Delivery queue is full ({self.max_depth} pending deliveries).")
+            self._space.clear()
+            try:
+                await asyncio.wait_for(self._space.wait(), min(remaining, self.poll_interval))
+            except asyncio.TimeoutError:
+                pass
+
+    async def start(self) -> None:
+        await asyncio.to_thread(self._recover)
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._consume()) for _ in range(self.consumers)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await asyncio.to_thread(self._recover)
+        self.close()
+
+    async def _consume(self) -> None:
+        while True:
+            row = None
+            try:
+                row = await asyncio.to_thread(self._claim)
+                if row is None:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                await self.deliver(row)
+            except Exception:
+                # Keep the consumer alive and hand the claimed row back to the queue.
+                logger.exception("Outbox consumer failed")
+                if row is not None:
+                    try:
+                        await asyncio.to_thread(self._release, row[0])
+                    except Exception:
+                        logger.exception("Could not release outbox row %s; it is recovered on restart", row[0])
+                await asyncio.sleep(self.poll_interval)
+
+    async def deliver(self, row: tuple) -> None:
+        row_id, webhook_url, body, attempts = row
+        with stage_seconds.time(stage="deliver_webhook"):
+            result = await post_with_retry(webhook_url, body, self.limiter, max_attempts=1)
+        attempts += 1
+        if result["status"] == "delivered":
+            await asyncio.to_thread(self._complete, row_id)
+            self.counters["delivered"] += 1
+        else:
+            dead = not result["retryable"] or attempts >= self.max_attempts
+            await asyncio.to_thread(self._fail, row_id, attempts, result["error"], dead)
+            self.counters["dead_lettered" if dead else "retried"] += 1
+            if not dead:
+                return
+        self._space.set()
+
+    async def metrics(self) -> dict:
+        snapshot = await asyncio.to_thread(self._snapshot)
+        snapshot.update(self.counters)
+        snapshot["consumers"] = len(self._tasks)
+        return snapshot
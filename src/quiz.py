@@ -0,0 +1,155 @@
+import random
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.vocabulary import VocabularyIndex
+
+
+class QuizIndex:
+    """
+    Similarity index over one vocabulary's definitions, used to pick
+    plausible wrong answers for multiple-choice quizzes.
+
+    Definitions are embedded as TF-IDF weighted character n-grams, hashed
+    with random signs into `dims` buckets and L2-normalised, so the whole
+    index is one dense float32 matrix and queries are a matrix product.
+    """
+
+    def __init__(self, words: Sequence[str], definitions: Sequence[str], dims: int = 256, ngram: int = 3):
+        self.words = list(words)
+        self.definitions = list(definitions)
+        self.dims = dims
+        self.ngram = ngram
+        self._word_rows: Dict[str, int] = {w.lower(): i for i, w in enumerate(self.words)}
+        counts = self._hashed_counts(self.definitions)
+        document_frequency = np.count_nonzero(counts, axis=0)
+        self.idf = (np.log((1 + len(self.definitions)) / (1 + document_frequency)) + 1).astype(np.float32)
+        self.vectors = self._normalise(counts * self.idf)
+
+    def __len__(self) -> int:
+        return len(self.definitions)
+
+    def _hashed_counts(self, texts: Sequence[str]) -> np.ndarray:
+        rows, buckets, signs = [], [], []
+        n = self.ngram
+        for row, text in enumerate(texts):
+            padded = f" {text.lower()} "
+            for start in range(max(1, len(padded) - n + 1)):
+                h = zlib.crc32(padded[start:start + n].encode("utf-8"))
+                rows.append(row)
+                buckets.append(h % self.dims)
+                signs.append(1.0 if h & 0x80000000 else -1.0)
+        counts = np.zeros((len(texts), self.dims), dtype=np.float32)
+        np.add.at(counts, (np.asarray(rows, dtype=np.intp), np.asarray(buckets, dtype=np.intp)),
+                  np.asarray(signs, dtype=np.float32))
+        return counts
+
+    @staticmethod
+    def _normalise(matrix: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    def gloss(self, word: str) -> Optional[str]:
+        """
+        Returns the vocabulary's own definition of `word`, if it has one.
+        """
+        row = self._word_rows.get(word.lower())
+        return self.definitions[row] if row is not None else None
+
+    def vectorize(self, texts: Sequence[str]) -> np.ndarray:
+        return self._normalise(self._hashed_counts(texts) * self.idf)
+
+    def distractors(
+        self,
+        words: Sequence[str],
+        definitions: Sequence[str],
+        k: int = 3,
+        pool: int = 6,
+        rng: Optional[random.Random] = None,
+        batch_size: int = 1024,
+    ) -> List[List[str]]:
+        """
+        For each (word, correct definition) pair, picks `k` wrong definitions
+        at random from the `pool` most similar ones in the index. The word's
+        own entry and duplicates of the correct definition are never picked.
+        """
+        rng = rng or random.Random()
+        pool = min(max(pool, k), len(self))
+        results: List[List[str]] = []
+        for start in range(0, len(definitions), batch_size):
+            chunk_words = words[start:start + batch_size]
+            chunk_definitions = definitions[start:start + batch_size]
+            similarity = self.vectorize(chunk_definitions) @ self.vectors.T
+            own = [self._word_rows.get(word.lower()) for word in chunk_words]
+            own_rows = [row for row, index in enumerate(own) if index is not None]
+            similarity[own_rows, [own[row] for row in own_rows]] = -np.inf
+            # Take a few extra candidates per row in case some are duplicates.
+            take = min(pool + 2, len(self))
+            top = np.argpartition(similarity, len(self) - take, axis=1)[:, -take:]
+            order = np.argsort(-np.take_along_axis(similarity, top, axis=1), axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            finite = np.isfinite(np.take_along_axis(similarity, top, axis=1))
+            for row, definition in enumerate(chunk_definitions):
+                seen = {definition.strip().lower()}
+                candidates = []
+                for index, ok in zip(top[row].tolist(), finite[row].tolist()):
+                    text = self.definitions[index]
+                    key = text.strip().lower()
+                    if ok and key not in seen:
+                        seen.add(key)
+                        candidates.append(text)
+                        if len(candidates) == pool:
+                            break
+                results.append(rng.sample(candidates, min(k, len(candidates))))
+        return results
+
+    def make_quizzes(
+        self, words: Sequence[str], definitions: Sequence[str], k: int = 3, rng: Optional[random.Random] = None
+    ) -> List[dict]:
+        """
+        Builds shuffled multiple-choice quizzes for many words at once.
+        """
+        rng = rng or random.Random()
+        quizzes = []
+        for word, definition, wrong in zip(words, definitions, self.distractors(words, definitions, k, rng=rng)):
+            options = [definition, *wrong]
+            rng.shuffle(options)
+            quizzes.append({
+                "quiz_question": f"What is the meaning of '{word}'?",
+                "quiz_options": options,
+                "correct_answer": definition,
+            })
+        return quizzes
+
+
+class QuizBank:
+    """
+    One QuizIndex per language, built once from the definitions the
+    vocabulary index read alongside each word list.
+    """
+
+    def __init__(self, vocabularies: VocabularyIndex, dims: int = 256):
+        self.vocabularies = vocabularies
+        self.dims = dims
+        self._indexes: Optional[Dict[str, QuizIndex]] = None
+
+    def load(self) -> None:
+        indexes = {}
+        for language in self.vocabularies.languages():
+            glossed = self.vocabularies.definitions(language)
+            if glossed is not None:
+                words, definitions = glossed
+                indexes[language.lower()] = QuizIndex(words, definitions, self.dims)
+        self._indexes = indexes
+
+    @property
+    def loaded(self) -> bool:
+        return self._indexes is not None
+
+    def get(self, language: str) -> Optional[QuizIndex]:
+        if self._indexes is None:
+            self.load()
+        return self._indexes.get(language.lower())
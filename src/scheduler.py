@@ -0,0 +1,256 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+from datetime import date, datetime, timedelta
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+import pytz
+
+from src.db import SQLiteDatabase
+from src.fanout import HostRateLimiter
+
+logger = logging.getLogger(__name__)
+
+
+def parse_lesson_time(lesson_time: str) -> tuple:
+    """
+    Parses "HH:MM" into (hour, minute), raising ValueError on bad input.
+    """
+    hour, minute = (int(part) for part in lesson_time.split(":"))
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"Invalid lesson time {lesson_time!r}")
+    return hour, minute
+
+
+def local_date(timezone: str, now: datetime) -> date:
+    return now.astimezone(pytz.timezone(timezone)).date()
+
+
+def lesson_at(lesson_date: date, lesson_time: str, timezone: str) -> datetime:
+    """
+    The UTC instant of a channel's lesson on a given local date.
+    """
+    hour, minute = parse_lesson_time(lesson_time)
+    naive = datetime(lesson_date.year, lesson_date.month, lesson_date.day, hour, minute)
+    return pytz.timezone(timezone).localize(naive).astimezone(pytz.utc)
+
+
+def next_lesson_date(lesson_time: str, timezone: str, now: datetime) -> date:
+    """
+    Local date of the channel's next lesson: today if lesson_time hasn't
+    passed yet in the channel's timezone, otherwise tomorrow.
+    """
+    today = local_date(timezone, now)
+    if now < lesson_at(today, lesson_time, timezone):
+        return today
+    return today + timedelta(days=1)
+
+
+class LessonStore(SQLiteDatabase):
+    """
+    SQLite store of known channels and their prepared lessons, keyed by the
+    channel and the local date the lesson is for, plus each channel's word
+    rotation state. A lesson's `delivered_at` is set once it has been sent.
+    """
+
+    def _create_schema(self, conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS channels ("
+            " channel TEXT PRIMARY KEY, language TEXT NOT NULL, lesson_time TEXT NOT NULL,"
+            " timezone TEXT NOT NULL, updated_at REAL NOT NULL)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS lessons ("
+            " channel TEXT NOT NULL, lesson_date TEXT NOT NULL, language TEXT NOT NULL,"
+            " lesson TEXT NOT NULL, built_at REAL NOT NULL, delivered_at REAL,"
+            " PRIMARY KEY (channel, lesson_date))"
+        )
+        if "delivered_at" not in {row[1] for row in conn.execute("PRAGMA table_info(lessons)")}:
+            conn.execute("ALTER TABLE lessons ADD COLUMN delivered_at REAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS rotations ("
+            " rotation_key TEXT PRIMARY KEY, n INTEGER NOT NULL, a INTEGER NOT NULL,"
+            " b INTEGER NOT NULL, cursor INTEGER NOT NULL)"
+        )
+
+    def register_channel(self, channel: str, language: str, lesson_time: str, timezone: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT INTO channels (channel, language, lesson_time, timezone, updated_at)"
+                " VALUES (?, ?, ?, ?, ?) ON CONFLICT (channel) DO UPDATE SET"
+                " language = excluded.language, lesson_time = excluded.lesson_time,"
+                " timezone = excluded.timezone, updated_at = excluded.updated_at",
+                (channel, language, lesson_time, timezone, time.time()),
+            )
+            conn.commit()
+
+    def channels(self) -> List[tuple]:
+        with self._lock:
+            return self._connection().execute(
+                "SELECT channel, language, lesson_time, timezone FROM channels ORDER BY channel"
+            ).fetchall()
+
+    def get(self, channel: str, lesson_date: date, language: str) -> Optional[dict]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT lesson FROM lessons WHERE channel = ? AND lesson_date = ? AND language = ?",
+                (channel, lesson_date.isoformat(), language),
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def has(self, channel: str, lesson_date: date, language: str) -> bool:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT 1 FROM lessons WHERE channel = ? AND lesson_date = ? AND language = ?",
+                (channel, lesson_date.isoformat(), language),
+            ).fetchone()
+        return row is not None
+
+    def put(self, channel: str, lesson_date: date, language: str, lesson: dict) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT INTO lessons (channel, lesson_date, language, lesson, built_at)"
+                " VALUES (?, ?, ?, ?, ?) ON CONFLICT (channel, lesson_date) DO UPDATE SET"
+                " language = excluded.language, lesson = excluded.lesson, built_at = excluded.built_at",
+                (channel, lesson_date.isoformat(), language, json.dumps(lesson), time.time()),
+            )
+            conn.commit()
+
+    def delivered(self, channel: str, lesson_date: date) -> bool:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT 1 FROM lessons WHERE channel = ? AND lesson_date = ? AND delivered_at IS NOT NULL",
+                (channel, lesson_date.isoformat()),
+            ).fetchone()
+        return row is not None
+
+    def claim_delivery(self, channel: str, lesson_date: date, language: str, lesson: dict) -> bool:
+        """
+        Marks the channel's lesson for `lesson_date` as delivered, storing the
+        lesson if it wasn't prepared. Returns False if it was already delivered.
+        """
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            claimed = conn.execute(
+                "INSERT INTO lessons (channel, lesson_date, language, lesson, built_at, delivered_at)"
+                " VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (channel, lesson_date) DO UPDATE SET"
+                " delivered_at = excluded.delivered_at WHERE lessons.delivered_at IS NULL",
+                (channel, lesson_date.isoformat(), language, json.dumps(lesson), now, now),
+            ).rowcount
+            conn.commit()
+        return claimed == 1
+
+    def release_delivery(self, channel: str, lesson_date: date) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "UPDATE lessons SET delivered_at = NULL WHERE channel = ? AND lesson_date = ?",
+                (channel, lesson_date.isoformat()),
+            )
+            conn.commit()
+
+    def get_rotation(self, rotation_key: str) -> Optional[Tuple[int, int, int, int]]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT n, a, b, cursor FROM rotations WHERE rotation_key = ?", (rotation_key,)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def put_rotation(self, rotation_key: str, state: Tuple[int, int, int, int]) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO rotations (rotation_key, n, a, b, cursor) VALUES (?, ?, ?, ?, ?)",
+                (rotation_key, *state),
+            )
+            conn.commit()
+
+    def prune(self, before: date) -> int:
+        with self._lock:
+            conn = self._connection()
+            deleted = conn.execute(
+                "DELETE FROM lessons WHERE lesson_date < ?", (before.isoformat(),)
+            ).rowcount
+            conn.commit()
+        return deleted
+
+
+class LessonScheduler:
+    """
+    Pre-builds each registered channel's next lesson once it is within
+    `lead_time` of the channel's lesson_time, so /tick only has to read it.
+    Builds are paced by a token bucket to stay inside upstream quotas.
+    """
+
+    def __init__(
+        self,
+        store: LessonStore,
+        build: Callable[[str, str], Awaitable[Optional[dict]]],
+        lead_time: timedelta = timedelta(hours=24),
+        interval: float = 300.0,
+        builds_per_second: float = 0.5,
+        burst: int = 5,
+    ):
+        self.store = store
+        self.build = build
+        self.lead_time = lead_time
+        self.interval = interval
+        self._limiter = HostRateLimiter(builds_per_second, burst)
+        self._task: Optional[asyncio.Task] = None
+        self.counters = {"runs": 0, "built": 0, "skipped_degraded": 0, "errors": 0}
+
+    async def run_once(self, now: Optional[datetime] = None) -> int:
+        """
+        Builds every lesson that is due for pre-generation. Returns how many were built.
+        """
+        now = now or datetime.now(pytz.utc)
+        self.counters["runs"] += 1
+        built = 0
+        for channel, language, lesson_time, timezone in await asyncio.to_thread(self.store.channels):
+            lesson_date = next_lesson_date(lesson_time, timezone, now)
+            if lesson_at(lesson_date, lesson_time, timezone) - now > self.lead_time:
+                continue
+            if await asyncio.to_thread(self.store.has, channel, lesson_date, language):
+                continue
+            await self._limiter.acquire("upstream")
+            try:
+                lesson = await self.build(language, channel)
+            except Exception:
+                logger.exception("Pre-building lesson for %s failed", channel)
+                self.counters["errors"] += 1
+                continue
+            if lesson is None:
+                continue
+            if lesson.get("degraded"):
+                # Leave it for the next run; /tick can still build one live.
+                self.counters["skipped_degraded"] += 1
+                continue
+            await asyncio.to_thread(self.store.put, channel, lesson_date, language, lesson)
+            built += 1
+        self.counters["built"] += built
+        await asyncio.to_thread(self.store.prune, (now - timedelta(days=2)).date())
+        return built
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Lesson pre-generation run failed")
+                self.counters["errors"] += 1
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
@@ -0,0 +1,281 @@
+import csv
+import itertools
+import json
+import logging
+import math
+import os
+import random
+import threading
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Vocabulary:
+    """
+    Compact, array-backed word list for one language.
+
+    Words live in a single UTF-8 buffer addressed by an offsets array, so a
+    list of a million words costs roughly its encoded size plus 4 bytes per
+    entry. Optional weights are turned into Walker alias tables, giving O(1)
+    weighted sampling.
+    """
+
+    def __init__(self, language: str, entries: Iterable[Tuple[str, float]]):
+        self.language = language
+        buffer = bytearray()
+        offsets = array("I", [0])
+        weights = array("d")
+        for word, weight in entries:
+            buffer += word.encode("utf-8")
+            offsets.append(len(buffer))
+            weights.append(weight)
+        self._buffer = bytes(buffer)
+        self._offsets = offsets
+        self._alias: Optional[Tuple[array, array]] = None
+        if len(weights) and min(weights) != max(weights):
+            self._alias = _build_alias_table(weights)
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._buffer[self._offsets[index]:self._offsets[index + 1]].decode("utf-8")
+
+    def __iter__(self) -> Iterator[str]:
+        return (self[i] for i in range(len(self)))
+
+    def sample(self, rng: random.Random = random) -> str:
+        """
+        Picks a word uniformly at random.
+        """
+        return self[rng.randrange(len(self))]
+
+    def weighted_sample(self, rng: random.Random = random) -> str:
+        """
+        Picks a word with probability proportional to its weight.
+        """
+        if self._alias is None:
+            return self.sample(rng)
+        probability, alias = self._alias
+        column = rng.randrange(len(self))
+        return self[column if rng.random() < probability[column] else alias[column]]
+
+    def nbytes(self) -> int:
+        size = len(self._buffer) + self._offsets.itemsize * len(self._offsets)
+        if self._alias is not None:
+            size += sum(a.itemsize * len(a) for a in self._alias)
+        return size
+
+
+def _build_alias_table(weights: array) -> Tuple[array, array]:
+    # Vose's alias method.
+    n = len(weights)
+    total = sum(weights)
+    scaled = array("d", (w * n / total for w in weights))
+    probability = array("d", bytes(8 * n))
+    alias = array("I", bytes(4 * n))
+    small = [i for i, p in enumerate(scaled) if p < 1.0]
+    large = [i for i, p in enumerate(scaled) if p >= 1.0]
+    while small and large:
+        s, l = small.pop(), large.pop()
+        probability[s] = scaled[s]
+        alias[s] = l
+        scaled[l] = scaled[l] + scaled[s] - 1.0
+        (small if scaled[l] < 1.0 else large).append(l)
+    for i in large + small:
+        probability[i] = 1.0
+    return probability, alias
+
+
+def read_records(path: str) -> Iterator[Tuple[str, float, str]]:
+    """
+    Streams (word, weight, definition) records from a CSV file with a `word`
+    column and optional `weight` and `definition` columns (header names are
+    case-insensitive), or from JSON lines with the same keys. A CSV without a
+    `word` header is read as a plain list, one word per line. Missing weights
+    are 1.0 and missing definitions "".
+    """
+    with open(path, encoding="utf-8", newline="") as handle:
+        if path.endswith(".jsonl"):
+            for line in handle:
+                if line.strip():
+                    record = json.loads(line)
+                    word = (record.get("word") or "").strip()
+                    if word:
+                        yield word, float(record.get("weight") or 1.0), (record.get("definition") or "").strip()
+            return
+
+        rows = csv.reader(handle)
+        first = next(rows, [])
+        header = [column.strip().lower() for column in first]
+        if "word" in header:
+            word_column = header.index("word")
+            weight_column = header.index("weight") if "weight" in header else None
+            definition_column = header.index("definition") if "definition" in header else None
+        else:
+            word_column, weight_column, definition_column = 0, None, None
+            rows = itertools.chain([first], rows)
+        for row in rows:
+            if len(row) <= word_column:
+                continue
+            word = row[word_column].strip()
+            if not word:
+                continue
+            weight = row[weight_column] if weight_column is not None and len(row) > weight_column else ""
+            definition = row[definition_column] if definition_column is not None and len(row) > definition_column else ""
+            yield word, float(weight) if weight else 1.0, definition.strip()
+
+
+def read_entries(path: str) -> Iterator[Tuple[str, float]]:
+    """
+    Streams (word, weight) pairs from a vocabulary file; see read_records.
+    """
+    return ((word, weight) for word, weight, _ in read_records(path))
+
+
+class ChannelRotation:
+    """
+    Per-channel no-repeat rotation over a vocabulary.
+
+    Each cycle walks a random affine permutation i -> (a*i + b) mod n with
+    gcd(a, n) == 1, which visits every index exactly once. Only (n, a, b, cursor)
+    is stored per channel, so rotation state is O(1) regardless of list size.
+    Pass a `store` with get_rotation/put_rotation (e.g. the LessonStore) to
+    keep rotations across restarts; its calls block, so run them in a thread.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None, store=None):
+        self._rng = rng or random.Random()
+        self._store = store
+        self._state: Dict[str, Tuple[int, int, int, int]] = {}
+        self._lock = threading.Lock()
+
+    def _new_cycle(self, n: int, previous: Optional[Tuple[int, int, int, int]]) -> Tuple[int, int, int, int]:
+        a = self._rng.randrange(1, n) if n > 1 else 1
+        while math.gcd(a, n) != 1:
+            a = self._rng.randrange(1, n)
+        b = self._rng.randrange(n)
+        if previous is not None and previous[0] == n and n > 1:
+            # Don't open the new cycle with the word that closed the last one.
+            _, last_a, last_b, _ = previous
+            while b == (last_a * (n - 1) + last_b) % n:
+                b = self._rng.randrange(n)
+        return n, a, b, 0
+
+    def _current(self, channel: str, size: int) -> Tuple[int, int, int, int]:
+        state = self._state.get(channel)
+        if state is None and self._store is not None:
+            state = self._store.get_rotation(channel)
+        if state is None or state[0] != size or state[3] >= size:
+            state = self._save(channel, self._new_cycle(size, state))
+        return state
+
+    def _save(self, channel: str, state: Tuple[int, int, int, int]) -> Tuple[int, int, int, int]:
+        self._state[channel] = state
+        if self._store is not None:
+            self._store.put_rotation(channel, state)
+        return state
+
+    def peek_index(self, channel: str, size: int) -> int:
+        """
+        The channel's current index, without moving past it.
+        """
+        with self._lock:
+            n, a, b, cursor = self._current(channel, size)
+        return (a * cursor + b) % n
+
+    def advance(self, channel: str, size: int, index: int) -> bool:
+        """
+        Moves the channel past `index` if that is its current index, so
+        repeated calls for the same lesson only advance once.
+        """
+        with self._lock:
+            n, a, b, cursor = self._current(channel, size)
+            if (a * cursor + b) % n != index:
+                return False
+            self._save(channel, (n, a, b, cursor + 1))
+        return True
+
+    def next_index(self, channel: str, size: int) -> int:
+        with self._lock:
+            n, a, b, cursor = self._current(channel, size)
+            self._save(channel, (n, a, b, cursor + 1))
+        return (a * cursor + b) % n
+
+    def _key(self, channel: str, vocabulary: Vocabulary) -> str:
+        return f"{vocabulary.language}:{channel}"
+
+    def peek_word(self, channel: str, vocabulary: Vocabulary) -> str:
+        return vocabulary[self.peek_index(self._key(channel, vocabulary), len(vocabulary))]
+
+    def advance_word(self, channel: str, vocabulary: Vocabulary, word: str) -> bool:
+        key, size = self._key(channel, vocabulary), len(vocabulary)
+        index = self.peek_index(key, size)
+        return vocabulary[index] == word and self.advance(key, size, index)
+
+    def next_word(self, channel: str, vocabulary: Vocabulary) -> str:
+        return vocabulary[self.next_index(self._key(channel, vocabulary), len(vocabulary))]
+
+
+class VocabularyIndex:
+    """
+    All vocabularies found in a directory, one file per language named after
+    it (e.g. `spanish.csv`, `german.jsonl`). Loaded once, at startup or on
+    first use. Each file is read once; words that come with a definition are
+    also kept as (words, definitions) for the quiz bank.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._languages: Optional[Dict[str, Vocabulary]] = None
+        self._definitions: Dict[str, Tuple[List[str], List[str]]] = {}
+
+    def load(self) -> None:
+        languages, definitions = {}, {}
+        if os.path.isdir(self.directory):
+            for name in sorted(os.listdir(self.directory)):
+                stem, ext = os.path.splitext(name)
+                if ext in (".csv", ".jsonl"):
+                    path = os.path.join(self.directory, name)
+                    glossed: Tuple[List[str], List[str]] = ([], [])
+
+                    def entries():
+                        for word, weight, definition in read_records(path):
+                            if definition:
+                                glossed[0].append(word)
+                                glossed[1].append(definition)
+                            yield word, weight
+
+                    try:
+                        languages[stem.lower()] = Vocabulary(stem.capitalize(), entries())
+                    except (OSError, ValueError):
+                        # One unreadable word list shouldn't stop the app from starting.
+                        logger.exception("Skipping vocabulary file %s", path)
+                        continue
+                    if glossed[0]:
+                        definitions[stem.lower()] = glossed
+        self._definitions = definitions
+        self._languages = languages
+
+    def definitions(self, language: str) -> Optional[Tuple[List[str], List[str]]]:
+        """
+        The language's (words, definitions) for the words that have one.
+        """
+        if self._languages is None:
+            self.load()
+        return self._definitions.get(language.lower())
+
+    def get(self, language: str) -> Optional[Vocabulary]:
+        if self._languages is None:
+            self.load()
+        vocabulary = self._languages.get(language.lower())
+        return vocabulary if vocabulary else None
+
+    def languages(self) -> Dict[str, int]:
+        if self._languages is None:
+            self.load()
+        return {v.language: len(v) for v in self._languages.values()}
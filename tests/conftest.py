@@ -0,0 +1,35 @@
+import os
+import tempfile
+import pytest
+
+# Keep on-disk state created by the app out of the working tree.
+_state_dir = tempfile.mkdtemp()
+os.environ.setdefault("LESSON_CACHE_PATH", os.path.join(_state_dir, "lesson_cache.sqlite3"))
+os.environ.setdefault("OUTBOX_PATH", os.path.join(_state_dir, "outbox.sqlite3"))
+os.environ.setdefault("LESSON_STORE_PATH", os.path.join(_state_dir, "lessons.sqlite3"))
+
+# The app runs under uvicorn's asyncio loop; don't exercise it under trio.
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+@pytest.fixture
+async def use_webhook_handler(monkeypatch):
+    """
+    Returns a setter that routes outgoing webhook POSTs to a mock handler;
+    the clients it creates are closed on teardown.
+    """
+    import httpx
+    from src import http_client
+
+    clients = []
+
+    def use(handler):
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        clients.append(client)
+        monkeypatch.setattr(http_client, "_client", client)
+        return client
+
+    yield use
+    for client in clients:
+        await client.aclose()
@@ -0,0 +1,57 @@
+import asyncio
+import time
+import pytest
+from src.cache import SQLiteStore, TTLCache, TwoLevelCache
+
+def test_ttl_cache_evicts_least_recently_used():
+    cache = TTLCache(maxsize=2)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    cache.get("a")
+    cache.set("c", 3, ttl=60)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.evictions == 1
+
+def test_ttl_cache_expires_entries(monkeypatch):
+    cache = TTLCache(maxsize=10)
+    cache.set("a", 1, ttl=5)
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 10)
+    assert cache.get("a") is None
+
+@pytest.mark.anyio
+async def test_concurrent_misses_are_coalesced():
+    calls = 0
+
+    async def loader(word):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return word.upper()
+
+    cache = TwoLevelCache("test", None, maxsize=10, ttl=60, negative_ttl=1)
+    results = await asyncio.gather(*(cache.get_or_fetch("hola", loader, "hola") for _ in range(5)))
+    assert results == ["HOLA"] * 5
+    assert calls == 1
+    assert cache.stats()["coalesced"] == 4
+
+@pytest.mark.anyio
+async def test_disk_store_survives_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+
+    async def loader(word):
+        return ["Definition not found.", "Example not found."]
+
+    first = TwoLevelCache("oxford", SQLiteStore(path), 10, ttl=60, negative_ttl=30,
+                          is_negative=lambda value: value[0] == "Definition not found.")
+    await first.get_or_fetch("xyz", loader, "xyz")
+    assert first.stats()["negative_stored"] == 1
+    first.store.close()
+
+    async def failing_loader(word):
+        raise AssertionError("should have been served from disk")
+
+    second = TwoLevelCache("oxford", SQLiteStore(path), 10, ttl=60, negative_ttl=30)
+    assert await second.get_or_fetch("xyz", failing_loader, "xyz") == ["Definition not found.", "Example not found."]
+    assert second.stats()["disk_hits"] == 1
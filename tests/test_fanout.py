@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+import httpx
+from httpx import AsyncClient
+from src.main import app
+from src.fanout import HostRateLimiter, fan_out, post_with_retry
+
+@pytest.mark.anyio
+async def test_post_with_retry_recovers_from_transient_errors(use_webhook_handler):
+    statuses = iter([503, 502, 200])
+    use_webhook_handler(lambda request: httpx.Response(next(statuses)))
+
+    result = await post_with_retry("http://hooks.test/a", b"{}", backoff_base=0.001)
+    assert result["status"] == "delivered"
+    assert result["attempts"] == 3
+
+@pytest.mark.anyio
+async def test_post_with_retry_does_not_retry_client_errors(use_webhook_handler):
+    use_webhook_handler(lambda request: httpx.Response(404))
+
+    result = await post_with_retry("http://hooks.test/a", b"{}", backoff_base=0.001)
+    assert result == {"status": "failed", "attempts": 1, "status_code": 404, "error": "HTTP 404", "retryable": False}
+
+@pytest.mark.anyio
+async def test_fan_out_keeps_input_order(use_webhook_handler):
+    use_webhook_handler(lambda request: httpx.Response(400 if request.url.path == "/bad" else 200))
+    limiter = HostRateLimiter(rate=1000, burst=1000)
+
+    results = await fan_out(
+        [("http://hooks.test/ok1", b"{}"), ("http://hooks.test/bad", b"{}"), ("http://hooks.test/ok2", b"{}")],
+        concurrency=2, limiter=limiter,
+    )
+    assert [r["status"] for r in results] == ["delivered", "failed", "delivered"]
+
+@pytest.mark.anyio
+async def test_tick_batch_queues_prepared_lessons(monkeypatch):
+    from datetime import date, datetime
+    from src import main
+
+    class MockDateTime:
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2025, 3, 1, 9, 0, tzinfo=tz)
+
+    lesson = {
+        "word": "hola", "definition": "hello", "usage": "Hola!", "pronunciation_url": "",
+        "quiz_question": "?", "quiz_options": ["hello"], "correct_answer": "hello", "degraded": None,
+    }
+    built = []
+
+    async def mock_fetch_daily_lesson(language: str, channel: str = None):
+        built.append(channel)
+        return {**lesson, "word": "gracias"}
+
+    enqueued = []
+
+    async def mock_enqueue(webhook_url, body):
+        enqueued.append(webhook_url)
+
+    monkeypatch.setattr('src.main.datetime', MockDateTime)
+    monkeypatch.setattr('src.main.fetch_daily_lesson', mock_fetch_daily_lesson)
+    monkeypatch.setattr(main.outbox, 'enqueue', mock_enqueue)
+    channels = [{"channel_webhook_url": f"http://hooks.test/batch-{i}", "language": lang}
+                for i, lang in enumerate(["Spanish", "French", "Spanish"])]
+    await asyncio.to_thread(main.lesson_store.put, channels[0]["channel_webhook_url"], date(2025, 3, 1), "Spanish", lesson)
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post("/tick/batch", json={"channels": channels})
+        again = await ac.post("/tick/batch", json={"channels": channels})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["queued"] == 3 and body["not_queued"] == 0
+    assert [c["channel_webhook_url"] for c in body["channels"]] == [c["channel_webhook_url"] for c in channels]
+    # The prepared lesson is read; only channels without one are built, each with its own rotation.
+    assert sorted(built) == sorted(c["channel_webhook_url"] for c in channels[1:])
+    assert sorted(enqueued) == sorted(c["channel_webhook_url"] for c in channels)
+    assert {c["status"] for c in again.json()["channels"]} == {"It's not time for the lesson yet."}
+
+@pytest.mark.anyio
+async def test_malformed_url_fails_only_its_own_channel(use_webhook_handler):
+    use_webhook_handler(lambda request: httpx.Response(200))
+
+    results = await fan_out(
+        [("http://hooks.test/ok", b"{}"), ("http://[::1", b"{}")], concurrency=2, backoff_base=0.001,
+    )
+    assert [r["status"] for r in results] == ["delivered", "failed"]
+    assert results[1]["error"].startswith("InvalidURL")
+    assert not results[1]["retryable"]
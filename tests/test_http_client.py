@@ -0,0 +1,46 @@
+import asyncio
+import pytest
+import httpx
+from httpx import AsyncClient
+from src.main import app
+from src import http_client
+from src.http_client import PerHostLimitedTransport
+
+@pytest.mark.anyio
+async def test_shared_client_is_reused():
+    client = http_client.get_http_client()
+    assert http_client.get_http_client() is client
+    await http_client.shutdown()
+    assert http_client.get_http_client() is not client
+    await http_client.shutdown()
+
+@pytest.mark.anyio
+async def test_http_pool_diagnostics():
+    await http_client.startup()
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/diagnostics/http-pool")
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["started"] is True
+    for key in ("open", "idle", "waiting", "max_per_host"):
+        assert key in stats
+    await http_client.shutdown()
+
+@pytest.mark.anyio
+async def test_per_host_limit_caps_concurrency():
+    active = 0
+    peak = 0
+
+    async def handler(request):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return httpx.Response(200, json={"ok": True})
+
+    transport = PerHostLimitedTransport(2, transport=httpx.MockTransport(handler))
+    async with httpx.AsyncClient(transport=transport) as client:
+        await asyncio.gather(*(client.get("http://upstream.test/") for _ in range(6)))
+    assert peak == 2
+    assert transport.stats()["waiting"] == 0
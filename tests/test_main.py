@@ -1,4 +1,5 @@
 import pytest
+import asyncio
 from httpx import AsyncClient
 from unittest.mock import AsyncMock, patch
 from src.main import app
@@ -20,7 +21,7 @@ async def test_tick_endpoint_not_time(monkeypatch):
         def now(cls, tz=None):
             return datetime(2025, 1, 1, 7, 0, tzinfo=tz)  # 07:00 AM
 
-    monkeypatch.setattr(pytz, 'datetime', MockDateTime)
+    monkeypatch.setattr('src.main.datetime', MockDateTime)
 
     async with AsyncClient(app=app, base_url="http://test") as ac:
         response = await ac.post("/tick", json={
@@ -39,7 +40,7 @@ async def test_tick_endpoint_time(monkeypatch):
         def now(cls, tz=None):
             return datetime(2025, 1, 1, 8, 0, tzinfo=tz)  # 08:00 AM
 
-    monkeypatch.setattr(pytz, 'datetime', MockDateTime)
+    monkeypatch.setattr('src.main.datetime', MockDateTime)
 
     # Mock external API calls to return dummy data
     async def mock_fetch_word_data(word: str):
@@ -52,10 +53,170 @@ async def test_tick_endpoint_time(monkeypatch):
     monkeypatch.setattr('src.main.fetch_pronunciation', mock_fetch_pronunciation)
 
     async with AsyncClient(app=app, base_url="http://test") as ac:
-        response = await ac.post("/tick", json={
+        response = await ac.post("/tick?compact=true", json={
             "channel_webhook_url": "http://example.com/webhook",
             "language": "Spanish",
             "lesson_time": "08:00"
         })
     assert response.status_code == 200
     assert response.json() == {"status": "Lesson scheduled for delivery"}
+
+@pytest.mark.anyio
+async def test_fetch_daily_lesson_degrades_when_source_is_late(monkeypatch):
+    from src import main
+
+    async def mock_fetch_word_data(word: str):
+        return "Dummy definition", "Dummy usage example."
+
+    async def slow_fetch_pronunciation(word: str):
+        await asyncio.sleep(1)
+        return "https://dummyurl.com/audio.mp3"
+
+    monkeypatch.setattr('src.main.fetch_word_data', mock_fetch_word_data)
+    monkeypatch.setattr('src.main.fetch_pronunciation', slow_fetch_pronunciation)
+    monkeypatch.setattr('src.main.PRONUNCIATION_TIMEOUT', 0.05)
+
+    lesson = await main.fetch_daily_lesson("Spanish")
+    assert lesson["definition"] == "Dummy definition"
+    assert lesson["pronunciation_url"] == ""
+    assert lesson["degraded"] == "definition_only"
+    assert main.upstream_seconds.count(source="forvo", outcome="timeout") >= 1
+
+@pytest.mark.anyio
+async def test_fetch_daily_lesson_degrades_when_source_is_rate_limited(monkeypatch):
+    import httpx
+    from src import http_client, main
+
+    async def mock_fetch_pronunciation(word: str):
+        return "https://dummyurl.com/audio.mp3"
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(429)))
+    monkeypatch.setattr(http_client, '_client', client)
+    monkeypatch.setattr('src.main.fetch_pronunciation', mock_fetch_pronunciation)
+    errors = main.upstream_seconds.count(source="oxford", outcome="error")
+
+    lesson = await main.fetch_daily_lesson("Klingon")
+    assert lesson["definition"] == "Definition not available."
+    assert lesson["degraded"] == "audio_only"
+    assert main.upstream_seconds.count(source="oxford", outcome="error") == errors + 1
+    await client.aclose()
+
+@pytest.mark.anyio
+async def test_fetch_daily_lesson_degrades_on_unreadable_payloads(monkeypatch):
+    import httpx
+    from src import http_client, main
+
+    html = httpx.Response(200, text="<html>Service unavailable</html>")
+    client = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: html))
+    monkeypatch.setattr(http_client, '_client', client)
+
+    lesson = await main.fetch_daily_lesson("Klingon")
+    assert lesson["degraded"] == "unavailable"
+    assert lesson["definition"] == "Definition not available."
+    await client.aclose()
+
+@pytest.mark.anyio
+async def test_tick_compact_response_delivers_once_per_day(monkeypatch):
+    from src import main
+
+    class MockDateTime:
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2025, 1, 2, 9, 0, tzinfo=tz)
+
+    async def mock_fetch_word_data(word: str):
+        return "Dummy definition", "Dummy usage example."
+
+    async def mock_fetch_pronunciation(word: str):
+        return "https://dummyurl.com/audio.mp3"
+
+    monkeypatch.setattr('src.main.datetime', MockDateTime)
+    monkeypatch.setattr('src.main.fetch_word_data', mock_fetch_word_data)
+    monkeypatch.setattr('src.main.fetch_pronunciation', mock_fetch_pronunciation)
+    renders = []
+    render_lesson_body = main.render_lesson_body
+    monkeypatch.setattr('src.main.render_lesson_body', lambda lesson: renders.append(lesson) or render_lesson_body(lesson))
+    enqueued = []
+
+    async def mock_enqueue(webhook_url, body):
+        enqueued.append(body)
+
+    monkeypatch.setattr(main.outbox, 'enqueue', mock_enqueue)
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        replies = []
+        for _ in range(3):
+            response = await ac.post("/tick?compact=true", json={
+                "channel_webhook_url": "http://example.com/compact-webhook",
+                "language": "French",
+            })
+            assert response.status_code == 200
+            replies.append(response.json())
+    assert replies == [
+        {"status": "Lesson scheduled for delivery"},
+        {"status": "It's not time for the lesson yet."},
+        {"status": "It's not time for the lesson yet."},
+    ]
+    assert len(renders) == 1 and len(enqueued) == 1
+
+@pytest.mark.anyio
+async def test_fetch_daily_lesson_quizzes_on_the_vocabulary_gloss(monkeypatch):
+    from src import main
+
+    async def mock_fetch_word_data(word: str):
+        return "Definition not found.", "Example not found."
+
+    async def mock_fetch_pronunciation(word: str):
+        return ""
+
+    monkeypatch.setattr('src.main.fetch_word_data', mock_fetch_word_data)
+    monkeypatch.setattr('src.main.fetch_pronunciation', mock_fetch_pronunciation)
+
+    lesson = await main.fetch_daily_lesson("Spanish", channel="gloss-test")
+    gloss = main.get_quiz_bank().get("Spanish").gloss(lesson["word"])
+    assert gloss is not None
+    assert lesson["correct_answer"] == gloss
+    assert gloss in lesson["quiz_options"]
+    assert "Definition not found." not in lesson["quiz_options"]
+
+@pytest.mark.anyio
+async def test_fetch_daily_lesson_skips_quiz_without_an_answer(monkeypatch):
+    from src import main
+
+    async def mock_fetch_word_data(word: str):
+        return "Definition not found.", "Example not found."
+
+    async def mock_fetch_pronunciation(word: str):
+        return ""
+
+    monkeypatch.setattr('src.main.fetch_word_data', mock_fetch_word_data)
+    monkeypatch.setattr('src.main.fetch_pronunciation', mock_fetch_pronunciation)
+
+    lesson = await main.fetch_daily_lesson("Klingon")
+    assert lesson["correct_answer"] is None and lesson["quiz_options"] == []
+    assert "**Quiz:**" not in main.render_lesson_message(lesson)["text"]
+
+@pytest.mark.anyio
+async def test_degraded_build_keeps_the_channels_word(monkeypatch):
+    from src import main
+
+    async def mock_fetch_word_data(word: str):
+        return "Dummy definition", "Dummy usage example."
+
+    async def failing_fetch_pronunciation(word: str):
+        raise main.UpstreamError("Forvo returned 503")
+
+    async def mock_fetch_pronunciation(word: str):
+        return "https://dummyurl.com/audio.mp3"
+
+    monkeypatch.setattr('src.main.fetch_word_data', mock_fetch_word_data)
+    monkeypatch.setattr('src.main.fetch_pronunciation', failing_fetch_pronunciation)
+    degraded = [await main.fetch_daily_lesson("Spanish", "http://example.com/rotation") for _ in range(2)]
+    assert degraded[0]["degraded"] == "definition_only"
+    assert degraded[0]["word"] == degraded[1]["word"]
+
+    monkeypatch.setattr('src.main.fetch_pronunciation', mock_fetch_pronunciation)
+    complete = await main.fetch_daily_lesson("Spanish", "http://example.com/rotation")
+    assert complete["word"] == degraded[0]["word"] and complete["degraded"] is None
+    following = await main.fetch_daily_lesson("Spanish", "http://example.com/rotation")
+    assert following["word"] != complete["word"]
@@ -0,0 +1,59 @@
+import pytest
+from httpx import AsyncClient
+from src.main import app
+from src.metrics import Registry
+
+def test_histogram_renders_cumulative_buckets():
+    registry = Registry()
+    histogram = registry.histogram("stage_seconds", "Stage time.", ["stage"], buckets=(0.1, 1.0))
+    histogram.observe(0.05, stage="fetch")
+    histogram.observe(0.5, stage="fetch")
+    histogram.observe(5.0, stage="fetch")
+    lines = registry.render().splitlines()
+    assert 'stage_seconds_bucket{stage="fetch",le="0.1"} 1' in lines
+    assert 'stage_seconds_bucket{stage="fetch",le="1"} 2' in lines
+    assert 'stage_seconds_bucket{stage="fetch",le="+Inf"} 3' in lines
+    assert 'stage_seconds_count{stage="fetch"} 3' in lines
+
+def test_histogram_quantile_interpolates_within_buckets():
+    histogram = Registry().histogram("upstream_seconds", "Latency.", ["source", "outcome"], buckets=(0.1, 0.2, 0.4))
+    for _ in range(5):
+        histogram.observe(0.05, source="oxford", outcome="ok")
+    for _ in range(5):
+        histogram.observe(0.15, source="oxford", outcome="timeout")
+    assert histogram.quantile(0.5, source="oxford") == pytest.approx(0.1)
+    assert histogram.quantile(0.75, source="oxford") == pytest.approx(0.15)
+    assert histogram.quantile(0.5, source="oxford", outcome="timeout") == pytest.approx(0.15)
+    assert histogram.quantile(0.5, source="forvo") == 0.0
+
+def test_counter_and_gauge_render_labels():
+    registry = Registry()
+    registry.counter("responses_total", "Responses.", ["host", "status"]).inc(host="api.test", status=200)
+    gauge = registry.gauge("in_flight", "In flight.", ["endpoint"])
+    with gauge.track_inprogress(endpoint="/tick"):
+        assert gauge.value(endpoint="/tick") == 1
+    text = registry.render()
+    assert 'responses_total{host="api.test",status="200"} 1' in text
+    assert 'in_flight{endpoint="/tick"} 0' in text
+    assert "# TYPE responses_total counter" in text
+
+@pytest.mark.anyio
+async def test_metrics_endpoint_reports_tick_stages(monkeypatch):
+    async def mock_fetch_word_data(word: str):
+        return "Dummy definition", "Dummy usage example."
+
+    async def mock_fetch_pronunciation(word: str):
+        return "https://dummyurl.com/audio.mp3"
+
+    monkeypatch.setattr('src.main.fetch_word_data', mock_fetch_word_data)
+    monkeypatch.setattr('src.main.fetch_pronunciation', mock_fetch_pronunciation)
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        await ac.post("/tick", json={"channel_webhook_url": "http://example.com/metrics-webhook", "lesson_time": "00:00"})
+        response = await ac.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    for stage in ("tick", "fetch_word_data", "fetch_pronunciation", "build_lesson", "send_lesson"):
+        assert f'lesson_stage_seconds_count{{stage="{stage}"}}' in response.text
+    assert 'ticks_in_flight{endpoint="/tick"} 0' in response.text
+    assert 'outbox{metric="depth"}' in response.text
@@ -0,0 +1,135 @@
+import asyncio
+import pytest
+import httpx
+from src.outbox import Outbox, QueueFull
+
+async def wait_until(predicate, timeout=2.0):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while not await predicate():
+        assert loop.time() < deadline, "condition not reached in time"
+        await asyncio.sleep(0.01)
+
+@pytest.mark.anyio
+async def test_consumers_deliver_queued_lessons(tmp_path, use_webhook_handler):
+    received = []
+
+    def handler(request):
+        received.append(request.content)
+        return httpx.Response(200)
+
+    use_webhook_handler(handler)
+    outbox = Outbox(str(tmp_path / "outbox.sqlite3"), consumers=2, poll_interval=0.05)
+    await outbox.start()
+    try:
+        for i in range(3):
+            await outbox.enqueue("http://hooks.test/", f'{{"n": {i}}}'.encode())
+
+        async def drained():
+            return (await outbox.metrics())["depth"] == 0
+        await wait_until(drained)
+    finally:
+        await outbox.stop()
+    assert sorted(received) == [b'{"n": 0}', b'{"n": 1}', b'{"n": 2}']
+    assert outbox.counters["delivered"] == 3
+
+@pytest.mark.anyio
+async def test_failing_delivery_is_dead_lettered(tmp_path, use_webhook_handler):
+    use_webhook_handler(lambda request: httpx.Response(503))
+    outbox = Outbox(str(tmp_path / "outbox.sqlite3"), max_attempts=3, consumers=1,
+                    poll_interval=0.01, backoff_base=0.001, backoff_cap=0.001)
+    await outbox.start()
+    try:
+        await outbox.enqueue("http://hooks.test/", b"{}")
+
+        async def dead():
+            return (await outbox.metrics())["dead"] == 1
+        await wait_until(dead)
+    finally:
+        await outbox.stop()
+    assert outbox.counters["retried"] == 2
+    assert outbox.counters["dead_lettered"] == 1
+
+@pytest.mark.anyio
+async def test_enqueue_applies_backpressure_when_full(tmp_path):
+    outbox = Outbox(str(tmp_path / "outbox.sqlite3"), max_depth=2, enqueue_timeout=0.05, poll_interval=0.01)
+    await outbox.enqueue("http://hooks.test/", b"{}")
+    await outbox.enqueue("http://hooks.test/", b"{}")
+    with pytest.raises(QueueFull):
+        await outbox.enqueue("http://hooks.test/", b"{}")
+    metrics = await outbox.metrics()
+    assert metrics["depth"] == 2 and metrics["rejected"] == 1
+
+@pytest.mark.anyio
+async def test_pending_deliveries_survive_restart(tmp_path, use_webhook_handler):
+    path = str(tmp_path / "outbox.sqlite3")
+    first = Outbox(path)
+    await first.enqueue("http://hooks.test/", b"{}")
+    first._claim()  # left in flight, as if the process died mid-delivery
+    await first.stop()
+
+    received = []
+    use_webhook_handler(lambda request: received.append(request) or httpx.Response(200))
+    second = Outbox(path, consumers=1, poll_interval=0.01)
+    await second.start()
+    try:
+        async def drained():
+            return (await second.metrics())["depth"] == 0
+        await wait_until(drained)
+    finally:
+        await second.stop()
+    assert len(received) == 1
+
+@pytest.mark.anyio
+async def test_malformed_url_is_dead_lettered_without_stopping_consumer(tmp_path, use_webhook_handler):
+    received = []
+    use_webhook_handler(lambda request: received.append(str(request.url)) or httpx.Response(200))
+    outbox = Outbox(str(tmp_path / "outbox.sqlite3"), consumers=1, poll_interval=0.01)
+    await outbox.enqueue("http://[::1", b"{}")
+    await outbox.enqueue("http://hooks.test/good", b"{}")
+    await outbox.start()
+    try:
+        async def drained():
+            return (await outbox.metrics())["depth"] == 0
+        await wait_until(drained)
+        metrics = await outbox.metrics()
+    finally:
+        await outbox.stop()
+    assert received == ["http://hooks.test/good"]
+    assert metrics["dead"] == 1 and metrics["consumers"] == 1
+    assert outbox.counters["dead_lettered"] == 1
+
+@pytest.mark.anyio
+async def test_tick_rejects_malformed_webhook_url():
+    from httpx import AsyncClient
+    from src.main import app
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        for url in ("http://[::1", "ftp://example.com/hook", "not a url"):
+            response = await ac.post("/tick", json={"channel_webhook_url": url})
+            assert response.status_code == 422, url
+
+@pytest.mark.anyio
+async def test_consumer_failure_puts_claimed_row_back(monkeypatch, tmp_path, use_webhook_handler):
+    received = []
+    use_webhook_handler(lambda request: received.append(request) or httpx.Response(200))
+    outbox = Outbox(str(tmp_path / "outbox.sqlite3"), consumers=1, poll_interval=0.01)
+    deliver = outbox.deliver
+    failures = []
+
+    async def flaky_deliver(row):
+        if not failures:
+            failures.append(row)
+            raise RuntimeError("consumer bug")
+        await deliver(row)
+
+    monkeypatch.setattr(outbox, "deliver", flaky_deliver)
+    await outbox.enqueue("http://hooks.test/", b"{}")
+    await outbox.start()
+    try:
+        async def drained():
+            return (await outbox.metrics())["depth"] == 0
+        await wait_until(drained)
+    finally:
+        await outbox.stop()
+    assert len(failures) == 1 and len(received) == 1
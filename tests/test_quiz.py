@@ -0,0 +1,49 @@
+import random
+from src.quiz import QuizBank, QuizIndex
+from src.vocabulary import VocabularyIndex
+
+WORDS = ["perro", "gato", "caballo", "libro", "revista", "mesa"]
+DEFINITIONS = [
+    "a domesticated dog kept as a pet",
+    "a domesticated cat kept as a pet",
+    "a large domesticated horse used for riding",
+    "a written work bound as a book",
+    "a magazine published every month",
+    "a piece of furniture with a flat top",
+]
+
+def test_distractors_prefer_similar_definitions():
+    index = QuizIndex(WORDS, DEFINITIONS)
+    [wrong] = index.distractors(["perro"], [DEFINITIONS[0]], k=2, pool=2, rng=random.Random(0))
+    assert sorted(wrong) == sorted([DEFINITIONS[1], DEFINITIONS[2]])
+
+def test_distractors_never_repeat_the_answer():
+    index = QuizIndex(WORDS + ["can"], DEFINITIONS + [DEFINITIONS[0]])
+    for wrong in index.distractors(["perro"] * 20, [DEFINITIONS[0]] * 20, k=3, rng=random.Random(3)):
+        assert len(wrong) == 3
+        assert DEFINITIONS[0] not in wrong
+
+def test_make_quizzes_shuffles_options():
+    index = QuizIndex(WORDS, DEFINITIONS)
+    quizzes = index.make_quizzes(WORDS, DEFINITIONS, rng=random.Random(1))
+    assert len(quizzes) == len(WORDS)
+    for word, definition, quiz in zip(WORDS, DEFINITIONS, quizzes):
+        assert quiz["quiz_question"] == f"What is the meaning of '{word}'?"
+        assert quiz["correct_answer"] == definition
+        assert sorted(set(quiz["quiz_options"])) == sorted(quiz["quiz_options"])
+        assert definition in quiz["quiz_options"] and len(quiz["quiz_options"]) == 4
+    assert {q["quiz_options"].index(q["correct_answer"]) for q in quizzes} != {0}
+
+def test_quiz_bank_reads_definitions_from_vocabulary(tmp_path):
+    (tmp_path / "spanish.csv").write_text("word,definition\nhola,hello\nlibro,a book\nsol,\n", encoding="utf-8")
+    (tmp_path / "german.csv").write_text("word\nhallo\n", encoding="utf-8")
+    (tmp_path / "french.csv").write_text("Word,Definition\nbonjour,hello\n", encoding="utf-8")
+    bank = QuizBank(VocabularyIndex(str(tmp_path)))
+    assert bank.get("Spanish").words == ["hola", "libro"]
+    assert bank.get("German") is None
+    assert bank.get("French").gloss("bonjour") == "hello"
+
+def test_gloss_looks_up_the_vocabulary_definition():
+    index = QuizIndex(WORDS, DEFINITIONS)
+    assert index.gloss("Gato") == DEFINITIONS[1]
+    assert index.gloss("hola") is None
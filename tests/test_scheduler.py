@@ -0,0 +1,84 @@
+import asyncio
+from datetime import date, datetime, timedelta
+import pytest
+import pytz
+from httpx import AsyncClient
+from src.main import app, lesson_store
+from src.scheduler import LessonScheduler, LessonStore, next_lesson_date
+
+LESSON = {
+    "word": "hola", "definition": "hello", "usage": "Hola!", "pronunciation_url": "",
+    "quiz_question": "?", "quiz_options": ["hello"], "correct_answer": "hello", "degraded": None,
+}
+
+def test_next_lesson_date_uses_channel_timezone():
+    # 08:00 in Berlin is 07:00 UTC in winter.
+    before = datetime(2025, 1, 1, 6, 30, tzinfo=pytz.utc)
+    after = datetime(2025, 1, 1, 7, 30, tzinfo=pytz.utc)
+    assert next_lesson_date("08:00", "Europe/Berlin", before) == date(2025, 1, 1)
+    assert next_lesson_date("08:00", "Europe/Berlin", after) == date(2025, 1, 2)
+
+@pytest.mark.anyio
+async def test_run_once_prebuilds_due_lessons_once(tmp_path):
+    store = LessonStore(str(tmp_path / "lessons.sqlite3"))
+    store.register_channel("due", "Spanish", "08:00", "UTC")
+    store.register_channel("later", "French", "20:00", "UTC")
+    store.register_channel("flaky", "German", "08:00", "UTC")
+    built = []
+
+    async def build(language, channel):
+        built.append(channel)
+        return {**LESSON, "degraded": "audio_only" if channel == "flaky" else None}
+
+    scheduler = LessonScheduler(store, build, lead_time=timedelta(hours=2), builds_per_second=1000)
+    now = datetime(2025, 1, 1, 6, 30, tzinfo=pytz.utc)
+
+    assert await scheduler.run_once(now) == 1
+    assert await scheduler.run_once(now) == 0
+    assert built == ["due", "flaky", "flaky"]
+    assert store.get("due", date(2025, 1, 1), "Spanish")["word"] == "hola"
+    assert store.get("flaky", date(2025, 1, 1), "German") is None
+    assert scheduler.counters["skipped_degraded"] == 2
+
+@pytest.mark.anyio
+async def test_tick_serves_prepared_lesson(monkeypatch):
+    async def unexpected_fetch(language, channel=None):
+        raise AssertionError("tick should not build a lesson that was prepared")
+
+    class MockDateTime:
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2025, 1, 1, 0, 0, tzinfo=tz)  # 09:00 in Tokyo
+
+    monkeypatch.setattr('src.main.fetch_daily_lesson', unexpected_fetch)
+    monkeypatch.setattr('src.main.datetime', MockDateTime)
+    channel = "http://example.com/prepared-webhook"
+    await asyncio.to_thread(lesson_store.put, channel, date(2025, 1, 1), "Spanish", LESSON)
+
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post("/tick", json={
+            "channel_webhook_url": channel, "language": "Spanish",
+            "lesson_time": "08:00", "timezone": "Asia/Tokyo",
+        })
+    assert response.status_code == 200
+    assert response.json()["lesson"]["word"] == "hola"
+
+def test_claim_delivery_only_once_per_day(tmp_path):
+    store = LessonStore(str(tmp_path / "lessons.sqlite3"))
+    store.put("prepared", date(2025, 1, 1), "Spanish", LESSON)
+    assert store.claim_delivery("prepared", date(2025, 1, 1), "Spanish", LESSON)
+    assert not store.claim_delivery("prepared", date(2025, 1, 1), "Spanish", LESSON)
+    assert store.delivered("prepared", date(2025, 1, 1))
+    assert not store.delivered("prepared", date(2025, 1, 2))
+    # Lessons built live at tick time are stored on delivery.
+    assert store.claim_delivery("live", date(2025, 1, 1), "French", LESSON)
+    assert store.get("live", date(2025, 1, 1), "French")["word"] == "hola"
+    store.release_delivery("live", date(2025, 1, 1))
+    assert not store.delivered("live", date(2025, 1, 1))
+    store.close()
+
+@pytest.mark.anyio
+async def test_tick_rejects_unknown_timezone():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post("/tick", json={"timezone": "Mars/Olympus_Mons"})
+    assert response.status_code == 422
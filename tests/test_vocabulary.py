@@ -0,0 +1,75 @@
+import json
+import random
+from src.scheduler import LessonStore
+from src.vocabulary import ChannelRotation, Vocabulary, VocabularyIndex, read_entries
+
+def test_vocabulary_indexes_words():
+    vocabulary = Vocabulary("Mandarin", [("你好", 1.0), ("谢谢", 1.0), ("书", 1.0)])
+    assert len(vocabulary) == 3
+    assert vocabulary[1] == "谢谢"
+    assert list(vocabulary) == ["你好", "谢谢", "书"]
+
+def test_weighted_sample_follows_weights():
+    vocabulary = Vocabulary("Spanish", [("hola", 1000.0), ("libro", 0.001)])
+    rng = random.Random(1)
+    picks = [vocabulary.weighted_sample(rng) for _ in range(1000)]
+    assert picks.count("hola") > 990
+
+def test_rotation_does_not_repeat_until_exhausted():
+    vocabulary = Vocabulary("Spanish", ((f"w{i}", 1.0) for i in range(50)))
+    rotation = ChannelRotation(random.Random(7))
+    first_cycle = [rotation.next_word("channel-a", vocabulary) for _ in range(50)]
+    assert sorted(first_cycle) == sorted(vocabulary)
+    second_cycle = [rotation.next_word("channel-a", vocabulary) for _ in range(50)]
+    assert sorted(second_cycle) == sorted(vocabulary)
+
+def test_rotation_does_not_repeat_across_cycles():
+    vocabulary = Vocabulary("Spanish", [("hola", 1.0), ("libro", 1.0), ("gato", 1.0)])
+    rotation = ChannelRotation(random.Random(11))
+    words = [rotation.next_word("channel-a", vocabulary) for _ in range(300)]
+    assert all(previous != current for previous, current in zip(words, words[1:]))
+
+def test_rotation_only_advances_past_the_current_word():
+    vocabulary = Vocabulary("Spanish", ((f"w{i}", 1.0) for i in range(20)))
+    rotation = ChannelRotation(random.Random(5))
+    word = rotation.peek_word("channel-a", vocabulary)
+    assert rotation.peek_word("channel-a", vocabulary) == word
+    assert rotation.advance_word("channel-a", vocabulary, word)
+    assert not rotation.advance_word("channel-a", vocabulary, word)
+    assert rotation.peek_word("channel-a", vocabulary) != word
+
+def test_rotation_resumes_from_store(tmp_path):
+    vocabulary = Vocabulary("Spanish", ((f"w{i}", 1.0) for i in range(20)))
+    store = LessonStore(str(tmp_path / "lessons.sqlite3"))
+    before_restart = [ChannelRotation(store=store).next_word("channel-a", vocabulary) for _ in range(10)]
+    after_restart = ChannelRotation(store=store)
+    rest = [after_restart.next_word("channel-a", vocabulary) for _ in range(10)]
+    assert sorted(before_restart + rest) == sorted(vocabulary)
+    store.close()
+
+def test_index_loads_csv_and_jsonl(tmp_path):
+    (tmp_path / "spanish.csv").write_text("word,weight\nhola,2\namigo,1\n", encoding="utf-8")
+    (tmp_path / "german.jsonl").write_text(
+        "\n".join(json.dumps({"word": w}) for w in ["hallo", "danke", "buch"]), encoding="utf-8")
+    index = VocabularyIndex(str(tmp_path))
+    assert index.languages() == {"German": 3, "Spanish": 2}
+    assert index.get("SPANISH")[0] == "hola"
+    assert index.get("Klingon") is None
+    assert list(read_entries(str(tmp_path / "spanish.csv"))) == [("hola", 2.0), ("amigo", 1.0)]
+
+def test_index_reads_headerless_lists_and_skips_broken_files(tmp_path):
+    (tmp_path / "spanish.csv").write_text("hola\nlibro\n", encoding="utf-8")
+    (tmp_path / "french.csv").write_text("word,weight\nbonjour,lots\n", encoding="utf-8")
+    index = VocabularyIndex(str(tmp_path))
+    assert list(index.get("Spanish")) == ["hola", "libro"]
+    assert index.get("French") is None
+
+
+def test_index_keeps_definitions_from_the_same_read(tmp_path):
+    (tmp_path / "german.jsonl").write_text(
+        "\n".join(json.dumps(r) for r in [{"word": "hallo", "definition": "hello"}, {"word": "buch"}]),
+        encoding="utf-8")
+    index = VocabularyIndex(str(tmp_path))
+    assert list(index.get("German")) == ["hallo", "buch"]
+    assert index.definitions("German") == (["hallo"], ["hello"])
+    assert index.definitions("Spanish") is None